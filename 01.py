@@ -1,19 +1,19 @@
 #!/usr/bin/env python3
 
-from common import read_input, combine, clean
+from common import read_ints
 from itertools import pairwise
 
 
 def differences(measurements):
-    return list( b - a for a, b in pairwise(measurements) )
+    return ( b - a for a, b in pairwise(measurements) )
 
 
 def triple_measures(measurements):
-    return list( a + b + c for (a, b), (_, c) in pairwise(pairwise(measurements)) )
+    return ( a + b + c for (a, b), (_, c) in pairwise(pairwise(measurements)) )
 
 
 def count_increases(measurements):
-    return len([x for x in measurements if x > 0])
+    return sum( 1 for x in measurements if x > 0 )
 
 
 def part_one(measurements):
@@ -29,8 +29,12 @@ def part_two(measurements):
 
     return count_increases(diffs)
 
+def load_input(files=None):
+    return read_ints(files)
+
+
 def main():
-    measurements = read_input(combine(int, clean))
+    measurements = load_input()
     print(f"part 1: {part_one(measurements)}")
     print(f"part 2: {part_two(measurements)}")
 
@@ -1,22 +1,20 @@
 #!/usr/bin/env python3
 
-import re
-
 from collections import namedtuple
 
-from common import read_input
+from common import iter_input
 
 Command = namedtuple('Command', ['command', 'distance'])
 Position = namedtuple('Position', ['x', 'y', 'aim'])
 
 
 def parse_command(cmd):
-    m = re.match(r"(?P<command>forward|down|up)\s+(?P<distance>\d+)", cmd)
-
-    if not m:
-        return None
-
-    return Command(m.group('command'), int(m.group('distance')))
+    # plain split rather than a regex, importing re costs more than the whole day
+    match cmd.split():
+        case [('forward' | 'down' | 'up') as command, distance] if distance.isdigit():
+            return Command(command, int(distance))
+        case _:
+            return None
 
 
 def part1_cmddir():
@@ -57,14 +55,25 @@ def travel(commands, cmd_dir):
     return position
 
 
-def main():
-    commands = read_input(parse_command)
-
+def part_one(commands):
     sol1 = travel(commands, part1_cmddir())
-    print(f"part 1: {sol1.x * sol1.y}")
+    return sol1.x * sol1.y
+
 
+def part_two(commands):
     sol2 = travel(commands, part2_cmddir())
-    print(f"part 2: {sol2.x * sol2.y}")
+    return sol2.x * sol2.y
+
+
+def load_input(files=None):
+    return iter_input(parse_command, files)
+
+
+def main():
+    commands = load_input()
+
+    print(f"part 1: {part_one(commands)}")
+    print(f"part 2: {part_two(commands)}")
 
 
 if __name__ == "__main__":
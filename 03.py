@@ -72,8 +72,12 @@ def part_two(report):
     return oxy * co2
 
 
+def load_input(files=None):
+    return read_input(clean, files)
+
+
 def main():
-    report = read_input(clean)
+    report = load_input()
 
     print(f"part 1: {part_one(report)}")
     print(f"part 2: {part_two(report)}")
@@ -54,8 +54,8 @@ class BingoBoard:
 -----END BOARD-----"""
 
 
-def parse_input():
-    content = read_input(clean)
+def load_input(files=None):
+    content = read_input(clean, files)
     drawn = []
     boards = []
     board = None
@@ -85,7 +85,8 @@ def print_board(board, pre=None, post=None):
         print(post)
 
 
-def part_one(drawn, boards):
+def part_one(game):
+    drawn, boards = game
     for n in range(len(drawn)):
         current_drawn = drawn[:n]
         for i, board in enumerate(boards):
@@ -95,7 +96,8 @@ def part_one(drawn, boards):
                 return score
 
 
-def part_two(drawn, boards):
+def part_two(game):
+    drawn, boards = game
     for n in range(len(drawn), 0, -1):
         current_drawn = drawn[:n]
         losing_boards = [ board for board in boards if board.score(current_drawn) < 0 ]
@@ -107,15 +109,16 @@ def part_two(drawn, boards):
                 
 
 def main():
-    drawn, boards = parse_input()
+    game = load_input()
+    drawn, boards = game
 
     debug(f"drawn: {drawn}")
     debug("boards:")
     for board in boards:
         print_board(board)
 
-    print(f"part 1: {part_one(drawn, boards)}")
-    print(f"part 2: {part_two(drawn, boards)}")
+    print(f"part 1: {part_one(game)}")
+    print(f"part 2: {part_two(game)}")
 
 
 if __name__ == "__main__":
@@ -2,11 +2,11 @@
 
 import re
 
-from collections import namedtuple, Counter
+from collections import namedtuple
 from functools import cache
 from itertools import chain
 
-from common import debug, read_input, Point, interpolate_points, color
+from common import debug, read_input, Point, PointArray, interpolate_points, rasterise_counts, color
 
 
 class Vent:
@@ -31,6 +31,7 @@ class Vent:
 
 
     def interpoints(self):
+        # reference for what SeaFloor does to all vents at once
         return interpolate_points(self.start, self.end)
 
 
@@ -46,19 +47,19 @@ class SeaFloor:
         if threshold is None:
             threshold = 1
 
-        locations = Counter()
         if diagonals is None or not diagonals:
-            for vent in self.vents:
-                if vent.is_diagonal():
-                    continue
-                points = vent.interpoints()
-                locations.update(points)
+            vents = [ vent for vent in self.vents if not vent.is_diagonal() ]
         else:
-            for vent in self.vents:
-                points = vent.interpoints()
-                locations.update(points)
+            vents = self.vents
 
-        return [ loc for loc in locations if locations[loc] >= threshold ]
+        if not vents:
+            return []
+
+        starts = PointArray.from_points( vent.start for vent in vents )
+        ends = PointArray.from_points( vent.end for vent in vents )
+        counts, area = rasterise_counts(starts, ends)
+
+        return [ area.point(i) for i in counts.at_least(threshold) ]
 
 
 def parse_vent(source):
@@ -76,10 +77,7 @@ def print_seafloor(sea_floor, poi = None):
     if not debug():
         return
 
-    xs = list(chain(*[(v.start.x, v.end.x) for v in sea_floor.vents]))
-    ys = list(chain(*[(v.start.y, v.end.y) for v in sea_floor.vents]))
-
-    dims = ( Point(min(xs), min(ys)), Point(max(xs), max(ys)) )
+    dims = PointArray.from_points(chain(*[(v.start, v.end) for v in sea_floor.vents])).bounds()
 
     diff = dims[1] - dims[0]
 
@@ -119,8 +117,12 @@ def part_two(vents):
     return len(dzs)
 
 
+def load_input(files=None):
+    return read_input(parse_vent, files)
+
+
 def main():
-    vents = read_input(parse_vent)
+    vents = load_input()
 
     print(f"part 1: {part_one(vents)}")
     print(f"part 2: {part_two(vents)}")
@@ -1,11 +1,8 @@
 #!/usr/bin/env python3
 
-import re
-
-from itertools import chain
 from collections import Counter
 
-from common import read_input, debug
+from common import read_ints, debug
 
 
 class School:
@@ -55,10 +52,6 @@ class School:
 #        return LanternFish(self.timer)
 
 
-def parse_fishes(source):
-    return [ int(timer) for timer in source.strip().split(',') ]
-
-
 def fish_str(fishes):
     return map(str, fishes)
 
@@ -82,8 +75,12 @@ def part_two(fishes):
     return simulate(fishes, 256).size()
 
 
+def load_input(files=None):
+    return read_ints(files)
+
+
 def main():
-    fishes = list(chain(*read_input(parse_fishes)))
+    fishes = load_input()
 
     print(f"part 1: {part_one(fishes)}")
     print(f"part 2: {part_two(fishes)}")
@@ -1,13 +1,6 @@
 #!/usr/bin/env python3
 
-from itertools import chain
-
-from common import read_input, debug
-
-
-def parse_crabs(source):
-    return [ int(pos) for pos in source.strip().split(',') ]
-
+from common import read_ints, debug
 
 
 def simple_engine(dist):
@@ -44,8 +37,12 @@ def part_two(crabs):
     return cheapest[1]
     
 
+def load_input(files=None):
+    return read_ints(files)
+
+
 def main():
-    crabs = list(chain(*read_input(parse_crabs)))
+    crabs = load_input()
 
     print(f"part 1: {part_one(crabs)}")
     print(f"part 2: {part_two(crabs)}")
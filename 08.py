@@ -1,10 +1,9 @@
 #!/usr/bin/env python3
 
 from itertools import chain
-from typing import NamedTuple,List
-from collections import Counter
+from collections import Counter, namedtuple
 
-from common import read_input
+from common import iter_input
 
 """
  aa
@@ -30,9 +29,9 @@ g | x |   | x | x |   | x | x |   | x | x | 7
 """
 
 
-class Reading(NamedTuple):
-    digits: List[str]
-    reading: List[str]
+class Reading(namedtuple('Reading', ['digits', 'reading'])):
+    # collections rather than typing.NamedTuple, typing is slow to import
+    __slots__ = ()
 
     def map1478(self):
         one = set([ x for x in self.digits if len(x) == 2 ][0])
@@ -128,21 +127,25 @@ def parse_reading(source):
 
 
 def part_one(readings):
-    translations = [ reading.translate1478() for reading in readings ]
+    translations = ( reading.translate1478() for reading in readings )
 
-    counter = Counter("".join(translations))
+    counter = Counter(chain.from_iterable(translations))
 
     return counter["1"] + counter["4"] + counter["7"] + counter["8"]
 
 
 def part_two(readings):
-    translations = [ reading.translate() for reading in readings ]
+    translations = ( reading.translate() for reading in readings )
     
     return sum( int(trans) for trans in translations )
     
 
+def load_input(files=None):
+    return iter_input(parse_reading, files)
+
+
 def main():
-    readings = read_input(parse_reading)
+    readings = load_input()
 
     print(f"part 1: {part_one(readings)}")
     print(f"part 2: {part_two(readings)}")
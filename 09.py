@@ -1,85 +1,51 @@
 #!/usr/bin/env python3
 
-from common import debug, read_input, neejbers, combine, intlist, clean, color
+from common import debug, read_grid, color
 
-import operator
-
-from collections import defaultdict
-from itertools import product, chain
+from itertools import chain
 
 
 class HeightMap:
-    def __init__(self, height_map):
-        self.height_map = defaultdict(lambda : 100)
-        self._size = (len(height_map[0]), len(height_map))
-
-        for j, row in enumerate(height_map):
-            for i, height in enumerate(row):
-                self.height_map[(i,j)] = height
+    def __init__(self, grid):
+        self.grid = grid
 
     def size(self):
-        return self._size[:]
+        return (self.grid.width, self.grid.height)
 
 
     def height(self, x, y):
-        return self.height_map[(x, y)]
-
-
-    def find_lower(self, x, y):
-        threshold = self.height(x, y)
-
-        def check_lower(i, j):
-            return self.height(i, j) <= threshold
-        
-        return self.find_neejbers(x, y, check_lower)
-
+        return self.grid.get((x, y), 100)
 
-    def find_higher(self, x, y):
-        threshold = self.height(x, y)
 
-        def check_higher(i, j):
-            h = self.height(i, j)
-            return h >= threshold and h < 9
+    def find_lower(self, i):
+        threshold = self.grid.cells[i]
+        return [ n for n in self.grid.neighbours(i) if self.grid.cells[n] <= threshold ]
 
-        return self.find_neejbers(x, y, check_higher)
 
-
-    def find_neejbers(self, x, y, func):
-        def ffunc(pos):
-            return func(*pos)
-
-        def valid(pos):
-            return pos[0] in range(self._size[0]) and pos[1] in range(self._size[1])
-
-        return list(filter(ffunc, filter(valid, neejbers(x, y, diagonal=False))))
+    def find_higher(self, i):
+        threshold = self.grid.cells[i]
+        return [ n for n in self.grid.neighbours(i) if threshold <= self.grid.cells[n] < 9 ]
 
 
     def find_minima(self):
-
-        def is_lowest(pos):
-            return len(self.find_lower(*pos)) == 0
-
-        # not directly over keys because find_lower seems to modify the dict
-        return set(filter(is_lowest, list(self.height_map.keys())))
+        lowest = [ i for i in range(len(self.grid)) if len(self.find_lower(i)) == 0 ]
+        return set(map(self.grid.position, lowest))
 
 
     def find_basins(self):
-        minima = self.find_minima()
-
         basins = []
-        
-        for minimum in minima:
-            basin = set([minimum])
-
-            while True:
-                higher = set(chain(*[ self.find_higher(x, y) for (x, y) in basin ])) - basin
 
-                if len(higher) == 0:
-                    break
+        for x, y in self.find_minima():
+            minimum = self.grid.index(x, y)
+            basin = set([minimum])
+            edge = [minimum]
 
-                basin |= higher
+            while edge:
+                higher = [ n for n in chain.from_iterable(map(self.find_higher, edge)) if n not in basin ]
+                basin.update(higher)
+                edge = higher
 
-            basins.append(basin)
+            basins.append(set(map(self.grid.position, basin)))
 
         return basins
 
@@ -103,9 +69,7 @@ def print_heightmap(heightmap, poi = None):
     print(topbot)
 
 
-def part_one(readings):
-    hmap = HeightMap(readings)
-
+def part_one(hmap):
     minima = hmap.find_minima()
 
     print_heightmap(hmap, minima)
@@ -113,9 +77,7 @@ def part_one(readings):
     return sum( hmap.height(*pos)+1 for pos in minima )
 
 
-def part_two(readings):
-    hmap = HeightMap(readings)
-
+def part_two(hmap):
     basins = hmap.find_basins()
 
     basin_sizes = list(sorted(map(len, basins)))
@@ -125,11 +87,19 @@ def part_two(readings):
     return basin_sizes[-3] * basin_sizes[-2] * basin_sizes[-1]
 
 
+def load_input(files=None):
+    return read_grid(files=files, typecode='b')
+
+
+def prepare(grid):
+    return HeightMap(grid)
+
+
 def main():
-    readings = read_input(combine(intlist, clean))
+    hmap = prepare(load_input())
 
-    print(f"part 1: {part_one(readings)}")
-    print(f"part 2: {part_two(readings)}")
+    print(f"part 1: {part_one(hmap)}")
+    print(f"part 2: {part_two(hmap)}")
 
 
 if __name__ == "__main__":
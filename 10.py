@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from common import read_input, clean
+from common import iter_input, clean
 
 from itertools import chain
 from collections import namedtuple
@@ -60,21 +60,25 @@ def score_completion(candidate):
 
 
 def part_one(source):
-    errors = [ find_error(line) for line in source ]
+    errors = ( find_error(line) for line in source )
 
     return sum(map(score_error, errors))
 
 
 def part_two(source):
-    completions = [ completion(line) for line in source if find_error(line) is None]
+    completions = ( completion(line) for line in source if find_error(line) is None )
 
     scores = list(sorted(map(score_completion, completions)))
 
     return scores[len(scores)//2]
 
 
+def load_input(files=None):
+    return iter_input(clean, files)
+
+
 def main():
-    source = read_input(clean)
+    source = load_input()
     print(f"part 1: {part_one(source)}")
     print(f"part 2: {part_two(source)}")
 
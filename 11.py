@@ -1,62 +1,43 @@
 #!/usr/bin/env python3
 
-from common import read_input, neejbers
+from common import read_grid
 
-from itertools import chain
-from collections import defaultdict
 
-
-def octogrid(octopi):
-    grid = {}
-    for j, row in enumerate(octopi):
-        for i, energy in enumerate(row):
-            grid[(i,j)] = energy
-
-    return grid
-
-
-def is_valid_neejber(x, y, xinterval, yinterval):
-    return x in xinterval and y in yinterval
-
-
-def valid_neejbers(x, y):
-    def ivn(pos):
-        return is_valid_neejber(pos[0], pos[1], range(10), range(10))
-
-    return list(filter(ivn, neejbers(x, y)))
+def bursting(energy):
+    return energy >= 10
 
 
 def step_octopi(octopi):
     # make a copy and increase energy
-    grid = { pos: energy+1 for pos, energy in octopi.items() }
-
-    def bursting(energy):
-        return energy >= 10
+    grid = octopi.copy()
+    energy = grid.cells
+    for i in range(len(energy)):
+        energy[i] += 1
 
     flashers = set()
 
-    def bursters(grid):
-        return list(filter(lambda pos: bursting(grid[pos]) and pos not in flashers, grid))
-
     # FLASH! AAAaaa!
-    while len(bursters(grid)) > 0:
-        ngrid = { pos: energy for pos, energy in grid.items() }
-        for i, j in bursters(grid):
-            flashers.add((i, j))
-            for x, y in valid_neejbers(i, j):
-                ngrid[(x, y)] += 1
-
-        grid = ngrid
+    bursters = [ i for i in range(len(energy)) if bursting(energy[i]) ]
+    while bursters:
+        i = bursters.pop()
+        if i in flashers:
+            continue
+
+        flashers.add(i)
+        for n in grid.neighbours(i, diagonal=True):
+            energy[n] += 1
+            if bursting(energy[n]) and n not in flashers:
+                bursters.append(n)
 
     # drain the energy of the flashers
-    for i, j in flashers:
-        grid[(i, j)] = 0
+    for i in flashers:
+        energy[i] = 0
 
     return grid, len(flashers)
 
 
 def part_one(octopi):
-    grid = octogrid(octopi)
+    grid = octopi
 
     total = 0
     for _ in range(100):
@@ -67,7 +48,7 @@ def part_one(octopi):
 
 
 def part_two(octopi):
-    grid = octogrid(octopi)
+    grid = octopi
 
     step = 0
     flashes = 0
@@ -78,12 +59,12 @@ def part_two(octopi):
     return step
 
 
-def parse_line(line):
-    return list(map(int, line.strip()))
+def load_input(files=None):
+    return read_grid(files=files, typecode='b')
 
 
 def main():
-    octopi = read_input(parse_line)
+    octopi = load_input()
     print(f"part 1: {part_one(octopi)}")
     print(f"part 2: {part_two(octopi)}")
 
@@ -1,71 +1,62 @@
 #!/usr/bin/env python3
 
-from common import read_input, Point, combine, clean
-from graph import Edge, Graph
+from common import read_input, Point, combine, clean, debug, metrics
+from graph import Edge, Graph, VisitPolicy
 
 
-class GraphOne(Graph):
-    def paths_between_util(self, node, dest, visited, path):
-        visited[node] += 1
-        path.append(node)
+def small(cave):
+    return cave.lower() == cave
 
-        def meaningful_visits():
-            mv = set()
-            for u, visits in visited.items():
-                if u.lower() == u and visits > 0:
-                    mv.add(u)
-            return mv
 
-        if node == dest:
-            yield list(path)
-        else:
-            for neejber in (self.neejbers(node) - meaningful_visits()):
-                yield from self.paths_between_util(neejber, dest, visited, path)
+class SmallCavesOnce(VisitPolicy):
+    def enter(self, visited, cave, bit):
+        if not small(cave):
+            return visited
+        if visited & bit:
+            return None
+        return visited | bit
 
-        path.pop()
-        visited[node] -= 1
 
+class OneSmallCaveTwice(VisitPolicy):
+    # state is (small caves seen, whether one has had its second visit)
+    initial = (0, False)
 
-class GraphTwo(Graph):
-    def paths_between_util(self, node, dest, visited, path):
-        visited[node] += 1
-        if len([ k for k, v in visited.items() if k.lower() == k and v == 2 ]) <= 1:
-            path.append(node)
+    def enter(self, state, cave, bit):
+        visited, twice = state
+        if not small(cave):
+            return state
+        if not visited & bit:
+            return (visited | bit, twice)
+        if twice or cave in ('start', 'end'):
+            return None
+        return (visited, True)
 
 
-            def meaningful_visits():
-                mv = set()
-                for u, visits in visited.items():
-                    if u in ('start', 'end') and visits > 0:
-                        mv.add(u)
-                    elif u.lower() == u and visits > 1:
-                        mv.add(u)
-                return mv
+def show_paths(caves, policy):
+    if not debug():
+        return
 
-            if node == dest:
-                yield list(path)
-            else:
-                for neejber in (self.neejbers(node) - meaningful_visits()):
-                    yield from self.paths_between_util(neejber, dest, visited, path)
+    def show(path):
+        print(",".join(path))
+        if metrics.enabled:
+            metrics.observe("path_length", len(path))
 
-            path.pop()
-        visited[node] -= 1
+    # listing every path is the slow part, so spread it over the cpus
+    caves.send_paths('start', 'end', show, policy, workers=None)
 
 
 def part_one(edges):
-    caves = GraphOne(edges)
+    caves = Graph(edges)
+    show_paths(caves, SmallCavesOnce())
 
-    paths = caves.paths_between('start', 'end')
-
-    return len(paths)
+    return caves.count_paths_between('start', 'end', SmallCavesOnce())
 
 
 def part_two(edges):
-    caves = GraphTwo(edges)
-
-    paths = caves.paths_between('start', 'end')
+    caves = Graph(edges)
+    show_paths(caves, OneSmallCaveTwice())
 
-    return len(paths)
+    return caves.count_paths_between('start', 'end', OneSmallCaveTwice())
 
 
 def parse_edge(line):
@@ -73,12 +64,18 @@ def parse_edge(line):
     return Edge(start, end)
 
 
-def main():
-    edges = read_input(combine(parse_edge, clean))
+def load_input(files=None):
+    edges = read_input(combine(parse_edge, clean), files)
 
     # add in reverse edges
     edges += [ edge.reverse() for edge in edges ]
 
+    return edges
+
+
+def main():
+    edges = load_input()
+
     print(f"part 1: {part_one(edges)}")
     print(f"part 2: {part_two(edges)}")
 
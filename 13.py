@@ -2,9 +2,8 @@
 
 import re
 
-from common import read_input, Point, clean, debug, color, Area
+from common import read_input, Point, PointArray, clean, debug, color, Area
 
-from collections import defaultdict
 from dataclasses import dataclass
 
 
@@ -16,57 +15,22 @@ class Fold:
 
 class Sheet:
     def __init__(self, dots):
-        self.contents = defaultdict(int)
-
-        for dot in dots:
-            self.contents[dot] += 1
+        self.dots = PointArray.from_points(dots).unique()
 
     def bounds(self):
-        xs = list(sorted( dot.x for dot in self.contents.keys() ))
-        ys = list(sorted( dot.y for dot in self.contents.keys() ))
-
-        area = Area(range(min(xs), max(xs)+1), range(min(ys), max(ys)+1))
-
-        return area
+        return Area.bounding(self.dots)
 
     def count_dots(self):
-        return len([ n for n in self.contents.values() if n > 0 ])
+        return len(self.dots)
 
     def foldY(self, y):
-        bounds = self.bounds()
-
-        bottom_size = max(bounds.y) - y
-
-        for j in range(bottom_size + 1):
-            for i in bounds.x:
-                orig = Point(i, y + j)
-                dest = Point(i, y - j)
-
-                if j > 0:
-                    n = self.contents[orig]
-                    if n > 0:
-                        self.contents[dest] += n
-
-                if orig in self.contents:
-                    del self.contents[orig]
+        # dots on the fold line itself disappear
+        folded = self.dots.reflect(y=y)
+        self.dots = PointArray.from_pairs( (i, j) for i, j in folded.pairs() if j != y ).unique()
 
     def foldX(self, x):
-        bounds = self.bounds()
-
-        right_size = max(bounds.x) - x
-
-        for i in range(right_size + 1):
-            for j in bounds.y:
-                orig = Point(x + i, j)
-                dest = Point(x - i, j)
-
-                if i > 0:
-                    n = self.contents[orig]
-                    if n > 0:
-                        self.contents[dest] += n
-
-                if orig in self.contents:
-                    del self.contents[orig]
+        folded = self.dots.reflect(x=x)
+        self.dots = PointArray.from_pairs( (i, j) for i, j in folded.pairs() if i != x ).unique()
 
     def fold(self, instruction):
         match instruction:
@@ -86,8 +50,7 @@ class Sheet:
         for j in bounds.y:
             line = "|"
             for i in bounds.x:
-                n = self.contents[Point(i, j)]
-                if n > 0:
+                if (i, j) in self.dots:
                     line += f"{color.BOLD}{color.GREEN}#{color.END}"
                 else:
                     line += f"{color.FAINT}.{color.END}"
@@ -129,13 +92,13 @@ def part_two(page):
     return '☝'
 
 
-def parse_page():
+def load_input(files=None):
     dots = []
     instructions = []
     
     all_dots = False
 
-    for line in read_input(clean):
+    for line in read_input(clean, files):
         if all_dots:
             m = re.match(r"fold along (?P<dir>[xy])=(?P<coord>[0-9]+)", line)
             if m:
@@ -151,7 +114,7 @@ def parse_page():
     
 
 def main():
-    page = parse_page()
+    page = load_input()
 
     print(f"part 1: {part_one(page)}")
     print(f"part 2: {part_two(page)}")
@@ -165,8 +165,12 @@ def parse_input(source = None):
                 
     
 
+def load_input(files=None):
+    return parse_input(read_input(clean, files))
+
+
 def main():
-    engine = parse_input()
+    engine = load_input()
 
     print(f"part 1: {part_one(engine)}")
     print(f"part 2: {part_two(engine)}")
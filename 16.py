@@ -6,6 +6,10 @@ from functools import reduce
 from common import read_input, debug, combine, clean, color
 
 
+# every line of the input is a transmission of its own
+PER_LINE = True
+
+
 class Transmission:
     def __init__(self, hexa):
         self._hex = hexa
@@ -183,38 +187,43 @@ def print_packet(packet):
 
 
 
-def part_one(transmission):
-    packet, remainder = decode_packet(transmission.bits)
-
+def part_one(packet):
     print_packet(packet)
 
     return packet.sum_version()
 
 
-def part_two(transmission):
-    packet, remainder = decode_packet(transmission.bits)
-
+def part_two(packet):
     print_packet(packet)
 
     return packet.calculate()
 
 
+def load_input(files=None):
+    return read_input(combine(Transmission, clean), files)
+
+
+def prepare(transmissions):
+    return [ decode_packet(transmission.bits)[0] for transmission in transmissions ]
+
+
 def main():
-    transmissions = read_input(combine(Transmission, clean))
+    transmissions = load_input()
+    packets = prepare(transmissions)
 
     extra_info = len(transmissions) > 1
 
-    for transmission in transmissions:
+    for transmission, packet in zip(transmissions, packets):
         if extra_info:
-            print(f"part 1: {transmission.hex} -> {part_one(transmission)}")
+            print(f"part 1: {transmission.hex} -> {part_one(packet)}")
         else:
-            print(f"part 1: {part_one(transmission)}")
+            print(f"part 1: {part_one(packet)}")
 
-    for transmission in transmissions:
+    for transmission, packet in zip(transmissions, packets):
         if extra_info:
-            print(f"part 2: {transmission.hex} -> {part_two(transmission)}")
+            print(f"part 2: {transmission.hex} -> {part_two(packet)}")
         else:
-            print(f"part 2: {part_two(transmission)}")
+            print(f"part 2: {part_two(packet)}")
 
 
 if __name__ == "__main__":
@@ -2,14 +2,18 @@
 
 import re
 
-from common import read_input, clean, combine, Point, sign, color, debug, Area
+from common import read_input, clean, combine, Point, PointArray, sign, color, debug, Area
 
 from dataclasses import dataclass
 from collections import defaultdict
-from itertools import product
+from itertools import compress, product
 from typing import List
 
 
+# every line of the input is a target area of its own
+PER_LINE = True
+
+
 @dataclass(frozen=True)
 class Probe:
     position: Point
@@ -66,6 +70,48 @@ def simulate_probe(probe, target_area):
     return Result(success, probe, path, max_height)
 
 
+def simulate_probes(probes, target_area):
+    """
+    Fly every probe at the same time, one step per round, and test all of
+    their positions against the target at once. Gives the same results as
+    `simulate_probe`, only without the paths.
+    """
+    right = max(target_area.x)
+    bottom = min(target_area.y)
+
+    positions = PointArray.from_points( probe.position for probe in probes )
+    velocities = PointArray.from_points( probe.velocity for probe in probes )
+
+    heights = list(positions.ys)
+    flying = list(range(len(probes)))
+    results = [None] * len(probes)
+
+    while flying:
+        positions = positions.translate(velocities)
+        velocities = PointArray(
+                [ vx - sign(vx, int) for vx in velocities.xs ],
+                [ vy - 1 for vy in velocities.ys ]
+                )
+
+        hits = target_area.contains(positions)
+
+        still = bytearray(len(flying))
+        for k, (i, x, y, hit) in enumerate(zip(flying, positions.xs, positions.ys, hits)):
+            if y > heights[i]:
+                heights[i] = y
+
+            if hit or x > right or y < bottom:
+                results[i] = Result(bool(hit), probes[i], None, heights[i])
+            else:
+                still[k] = 1
+
+        flying = list(compress(flying, still))
+        positions = positions.compress(still)
+        velocities = velocities.compress(still)
+
+    return results
+
+
 def print_result(result):
     debug(f"result: {result.probe}, {result.max_height}")
 
@@ -85,9 +131,9 @@ def part_one(target_area):
 
     start = Point(0, 0)
 
-    for vx, vy in product(xs, ys):
-        probe = Probe(start, Point(vx, vy))
-        result = simulate_probe(probe, target_area)
+    probes = [ Probe(start, Point(vx, vy)) for vx, vy in product(xs, ys) ]
+
+    for result in simulate_probes(probes, target_area):
         #print_result(result)
         if result.success:
             if result.max_height > best.max_height:
@@ -112,23 +158,23 @@ def part_two(target_area):
     minx = min(filter(cond, range(min(target_area.x))))
     xs = range(minx, max(target_area.x) + 1)
 
-    results = []
     start = Point(0, 0)
 
-    for vx, vy in product(xs, ys):
-        probe = Probe(start, Point(vx, vy))
-        result = simulate_probe(probe, target_area)
+    probes = [ Probe(start, Point(vx, vy)) for vx, vy in product(xs, ys) ]
 
-        if result.success:
-            results.append(result)
+    results = [ result for result in simulate_probes(probes, target_area) if result.success ]
 
     velocities = set(map(lambda r: r.probe.velocity, results))
 
     return len(velocities)
 
 
+def load_input(files=None):
+    return read_input(combine(parse_target, clean), files)
+
+
 def main():
-    content = read_input(combine(parse_target, clean))
+    content = load_input()
 
     for target in content:
         print(f"part 1: {part_one(target)}")
@@ -3,34 +3,41 @@
 
 from common import read_input, combine, clean, debug, color
 
-import pyparsing as pp
-
 from collections import namedtuple, defaultdict
 from copy import deepcopy
+from functools import cache
 from itertools import permutations
 
 
-def as_int(t):
-    return int(t[0])
+@cache
+def grammar():
+    # pyparsing takes longer to import than the rest of the day together,
+    # so it is only loaded once there is a number to parse
+    import pyparsing as pp
+
+    def as_int(t):
+        return int(t[0])
+
+    def as_pair(t):
+        _, a, _, b, _ = t
+        return pp.ParseResults.List([a, b])
 
-def as_pair(t):
-    _, a, _, b, _ = t
-    return pp.ParseResults.List([a, b])
+    NUMBER = pp.Word(pp.nums).set_parse_action(as_int)
+    OPEN = pp.Char('[')
+    CLOSE = pp.Char(']')
+    COMMA = pp.Char(',')
 
-NUMBER = pp.Word(pp.nums).set_parse_action(as_int)
-OPEN = pp.Char('[')
-CLOSE = pp.Char(']')
-COMMA = pp.Char(',')
+    sfn = pp.Forward().setName('sfn')
+    single = NUMBER
+    pair = (OPEN 
+            + sfn.set_results_name('left')
+            + COMMA
+            + sfn.set_results_name('right')
+            + CLOSE
+            ).set_parse_action(as_pair)
+    sfn << ( single | pair ).set_results_name('num')
 
-sfn = pp.Forward().setName('sfn')
-single = NUMBER
-pair = (OPEN 
-        + sfn.set_results_name('left')
-        + COMMA
-        + sfn.set_results_name('right')
-        + CLOSE
-        ).set_parse_action(as_pair)
-sfn << ( single | pair ).set_results_name('num')
+    return sfn
 
 
 def sfn_split(number, done = None):
@@ -179,7 +186,7 @@ def sfn_mag(number):
 
 
 def parse_number(line):
-    return sfn.parseString(line)[0]
+    return grammar().parseString(line)[0]
 
 
 
@@ -220,8 +227,12 @@ def tests():
 
 
 
+def load_input(files=None):
+    return read_input(combine(parse_number, clean), files)
+
+
 def main():
-    numbers = read_input(combine(parse_number, clean))
+    numbers = load_input()
 
     if tests() > 0:
         return
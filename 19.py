@@ -1,12 +1,10 @@
 #!/usr/bin/env python3
 
-from common import read_input, clean, color, debug, ident, combine
+from common import read_input, clean, color, debug, ident, combine, metrics, Progress
 
 import os
 import re
 
-import multiprocessing as mp
-
 from dataclasses import dataclass
 from itertools import chain, combinations, product
 from time import time
@@ -186,16 +184,27 @@ def find_match(known, candidate):
                 """
                 found = cand.with_coord( -trans )
                 debug(f"  {color.RED}MATCH FOUND{color.END} - {known.id} -- {found.id} @ {found.coord} #{n}")
+                metrics.count("translations", n)
+                metrics.count("matches")
                 return found
 
+    metrics.count("translations", n)
     return None
 
 
-def main():
-    start = time()
-    content = read_input(clean)
+def measured_find_match(known, candidate):
+    # runs in a worker process, so the metrics have to travel back with the result
+    metrics.reset()
+    return find_match(known, candidate), metrics.snapshot()
+
+
+def load_input(files=None):
+    return parse_input(read_input(clean, files))
 
-    scanners = parse_input(content)
+
+def main(files=None):
+    start = time()
+    scanners = load_input(files)
 
     scanmap = { s.id: s for s in scanners }
 
@@ -204,16 +213,20 @@ def main():
 
     found = [known]
 
+    progress = Progress()
 
     def print_progress():
-        if debug():
+        if progress.due():
             since = f"{time() - start:.3f}s"
             s_timing = f"{color.FAINT}[{since:>10}]{color.END}"
 
             s_done = color.GREEN + color.FAINT + (' '.join(map(lambda s: str(s.id), found))) + color.END
             s_left = ' '.join(map(str, scanmap))
 
-            print(f"{s_timing} Progress: {s_done} | {s_left}") 
+            progress.show(f"{s_timing} Progress: {s_done} | {s_left}")
+
+    # only main needs worker processes, importing the module should not pay for them
+    from multiprocessing import Pool
 
     cpu_count = len(os.sched_getaffinity(0))
 
@@ -223,14 +236,18 @@ def main():
         print_progress()
 
         matches = []
-        def collect(match):
+        def collect(result):
+            match, snapshot = result
+            metrics.merge(snapshot)
             if match:
                 matches.append(match)
 
-        with mp.Pool(cpu_count) as pool:
+        metrics.count("rounds")
+
+        with Pool(cpu_count) as pool:
 
             for scanner in scanmap.values():
-                pool.apply_async(find_match, args=(known, scanner), callback=collect)
+                pool.apply_async(measured_find_match, args=(known, scanner), callback=collect)
 
             pool.close()
             pool.join()
@@ -240,7 +257,7 @@ def main():
         for match in matches:
             del scanmap[match.id]
 
-    print_progress()
+    progress.done()
 
     debug(f"known world contained by {known}")
 
@@ -1,67 +1,77 @@
 #/usr/bin/env python3
 
 
-from common import read_input, clean, Area, neejbers, debug, color
+from common import read_input, clean, Area, Grid2D, debug, color
 
-from collections import defaultdict
 from dataclasses import dataclass
 
 
+PIXELS = '.#'
+
+
 @dataclass(frozen=True)
 class Image:
-    data: defaultdict[str]
+    # 1 for a lit pixel, the grid sits on `extent` and `background` is
+    # what every pixel outside of it looks like
+    grid: Grid2D
+    extent: Area
+    background: int = 0
     n: int = 0
 
     def __getitem__(self, pos):
-        return self.data[pos]
+        x, y = pos
+        if pos in self.extent:
+            return PIXELS[self.grid[(x - self.extent.x.start, y - self.extent.y.start)]]
+        return PIXELS[self.background]
 
     def area(self):
-        xs, ys = zip(*list(self.data))
-        return Area(
-                range(min(xs) - 1, max(xs) + 2),
-                range(min(ys) - 1, max(ys) + 2)
-                )
+        # one cell around what is known, where the infinite rest can start to show
+        return self.extent.grow(1)
 
     def lit(self):
-        return sum( 1 for c in self.data.values() if c == '#' )
+        return sum(self.grid.cells)
 
 
 class Enhancer:
     def __init__(self, algo):
         self._algo = algo
-        self._switch = algo[0] == '#'
-        self._trans = { '.' : '0', '#' : '1' }
+        self._table = bytes( PIXELS.index(c) for c in algo )
 
     def __call__(self, image):
-        if self._switch:
-            dflt = [
-                    self._algo[0],
-                    self._algo[-1]
-                    ][image.n % 2]
-        else:
-            dflt = '.'
-        data = defaultdict(lambda:dflt)
-        area = image.area()
-        
-        for y in area.y:
-            for x in area.x:
-                binary = "".join( self._trans[image[pos]] for pos in neejbers(x, y, center = True))
-                idx = int(binary, 2)
+        # with a border of two every pixel of the new image, one bigger on
+        # each side, has all of its 3x3 square on the padded grid
+        padded = image.grid.padded(2, image.background)
+        cells = padded.cells
+        offsets = padded.offsets(diagonal=True, center=True)
+        table = self._table
+
+        width = image.grid.width + 2
+        height = image.grid.height + 2
+        grid = Grid2D(width, height, typecode='b')
+
+        k = 0
+        for y in range(height):
+            start = (y + 1) * padded.width + 1
+            for i in range(start, start + width):
+                idx = 0
+                for offset in offsets:
+                    idx = idx << 1 | cells[i + offset]
 
-                data[(x, y)] = self._algo[idx]
+                grid.cells[k] = table[idx]
+                k += 1
 
+        # the infinite rest is all dark or all lit, so it looks up index 0 or 511
+        background = table[-image.background]
 
-        return Image(data, image.n + 1)
+        return Image(grid, image.extent.grow(1), background, image.n + 1)
 
 
 def parse_input(content):
     algo = ""
-    data = defaultdict(lambda:'.')
+    rows = []
 
     done = False
 
-    j = 0
-
     for line in content:
         if not done:
             if len(line):
@@ -69,18 +79,25 @@ def parse_input(content):
             else:
                 done = True
         else:
-            for i, c in enumerate(line):
-                data[(i, j)] = c
-            j += 1
+            rows.append([ PIXELS.index(c) for c in line ])
+
+    grid = Grid2D.from_rows(rows, 'b')
+    return Enhancer(algo), Image(grid, grid.area())
+
+
+def load_input(files=None):
+    return read_input(clean, files)
+
 
-    return Enhancer(algo), Image(data)
+def prepare(content):
+    return parse_input(content)
 
 
 def main():
-    content = read_input(clean)
+    puzzle = prepare(load_input())
 
-    print(f"part 1: {part_one(content)}")
-    print(f"part 2: {part_two(content)}")
+    print(f"part 1: {part_one(puzzle)}")
+    print(f"part 2: {part_two(puzzle)}")
 
 
 def print_image(image, last_line=None):
@@ -106,8 +123,8 @@ def print_image(image, last_line=None):
     print(topbot)
 
 
-def part_one(content):
-    enhance, image = parse_input(content)
+def part_one(puzzle):
+    enhance, image = puzzle
 
     debug(f"original:")
     print_image(image)
@@ -123,8 +140,8 @@ def part_one(content):
     return image.lit()
 
 
-def part_two(content):
-    enhance, image = parse_input(content)
+def part_two(puzzle):
+    enhance, image = puzzle
 
     for i in range(50):
         image = enhance(image)
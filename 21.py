@@ -54,6 +54,7 @@ def parse_player(line):
 
 
 def part_one(players):
+    players = players[:]
     np = len(players)
 
     die = Die(triple(deterministic(100)))
@@ -128,8 +129,12 @@ def part_two(players):
     return max(wins)
 
 
+def load_input(files=None):
+    return read_input(combine(parse_player, clean), files)
+
+
 def main():
-    players = read_input(combine(parse_player, clean))
+    players = load_input()
 
     print(f"part  1: {part_one(players[:])}")
     print(f"part  2: {part_two(players[:])}")
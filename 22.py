@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from common import read_input, combine, clean, debug, color
+from common import read_input, combine, clean, debug, color, metrics, Progress
 
 import re
 
@@ -149,6 +149,7 @@ def subdivide_intervals(intervals):
             yield (set(open_intervals), range(a.value, b.value))
 
     debug(f"max open intervals: {max_open}")
+    metrics.maximum("open_intervals", max_open)
 
     return
 
@@ -171,24 +172,33 @@ def subdivide_cuboids(cuboids):
 def part_two(actions):
     cuboids = subdivide_cuboids(map(lambda a: a.cuboid, actions))
     start = time()
+    progress = Progress()
 
     total = 0
     for idx, cuboid in enumerate(cuboids):
         labels = sorted(cuboid.labels)
 
+        if metrics.enabled:
+            metrics.count("subcuboids")
+
         if len(labels) > 0 and actions[labels[-1]].on:
             total += len(cuboid)
-            if debug():
+            if progress.due():
                 elapsed = timedelta(seconds=time() - start)
-                print(f"  {color.FAINT}[{elapsed}]{color.END} {total:>20,} cubes (added {len(cuboid):>15,}) #{idx:,}", end = '\r')
+                progress.show(f"  {color.FAINT}[{elapsed}]{color.END} {total:>20,} cubes (added {len(cuboid):>15,}) #{idx:,}")
 
-    debug(f"  {total:>20,} cubes! {' '*25}")
+    progress.done()
+    debug(f"  {total:>20,} cubes!")
 
     return total
 
 
+def load_input(files=None):
+    return read_input(combine(parse_action, clean), files)
+
+
 def main():
-    actions = read_input(combine(parse_action, clean))
+    actions = load_input()
 
     print(f"part 1: {part_one(actions)}")
     print(f"part 2: {part_two(actions)}")
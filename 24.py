@@ -138,8 +138,12 @@ def parse_instr(instr):
             raise ValueError(f"Could not make sense of `{instr}`")
 
 
-def main():
-    instructions = read_input(combine(parse_instr, clean))
+def load_input(files=None):
+    return read_input(combine(parse_instr, clean), files)
+
+
+def main(files=None):
+    instructions = load_input(files)
 
     def program(memory, verbose=None):
         alu = ALU(memory)
@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import importlib
+import io
+import json
+import os
+import pickle
+import re
+import shutil
+import sys
+
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from datetime import datetime
+from time import perf_counter, process_time
+from typing import Any
+
+from common import cpu_count, disabled, metrics, profile
+
+
+SCRIPTDIR = os.path.dirname(os.path.realpath(__file__))
+
+YEAR = 2021
+
+PART_LINE = re.compile(r"^part\s+([0-9]+):\s*(.*)$", re.MULTILINE)
+
+# started first when running in parallel so they do not hold up the rest
+SLOW_DAYS = (15, 19, 22, 24)
+
+CACHE_DIR = os.path.join(SCRIPTDIR, ".cache", "answers")
+PREPARED_DIR = os.path.join(SCRIPTDIR, ".cache", "prepared")
+INPUT_DIR = os.path.join(SCRIPTDIR, ".cache", "inputs", str(YEAR))
+
+# every day is built on these, so they are part of every cache key
+SHARED_SOURCES = ("common.py", "graph.py")
+
+
+@dataclass(frozen=True)
+class Timing:
+    day: int
+    part: str
+    wall: float
+    cpu: float
+    answer: Any = None
+    metrics: dict = None
+    cached: bool = False
+
+    def __str__(self):
+        answer = "" if self.answer is None else f"  {self.answer}"
+        if self.cached:
+            answer += " (cached)"
+        return f"{self.day:02d} {self.part:>4} {self.wall * 1000:12.3f}ms wall {self.cpu * 1000:12.3f}ms cpu{answer}"
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def source_key(module, files):
+    digest = hashlib.sha256()
+    sources = [module.__file__] + [ os.path.join(SCRIPTDIR, name) for name in SHARED_SOURCES ]
+    for path in sources + list(files):
+        digest.update(file_digest(path))
+    return digest.hexdigest()
+
+
+class AnswerCache:
+    """
+    Answers on disk, keyed by a hash of the input together with the day's
+    source and the shared modules, so changing any of them is a cache miss.
+    With `read` off answers are recomputed but still stored.
+
+    Every part has a file of its own, so parts of one day solved in parallel
+    never write the same file. A file that cannot be read is a miss.
+    """
+    def __init__(self, directory = CACHE_DIR, read = True):
+        self.directory = directory
+        self.read = read
+
+    def path(self, key, part):
+        return os.path.join(self.directory, f"{key}.{part}.json")
+
+    def get(self, key):
+        if not self.read:
+            return {}
+
+        answers = {}
+        for part in ("1", "2", "main"):
+            try:
+                with open(self.path(key, part)) as f:
+                    answers[part] = json.load(f)
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                print(f"ignoring cached answer {self.path(key, part)}: {e}", file=sys.stderr)
+        return answers
+
+    def put(self, key, part, answer):
+        os.makedirs(self.directory, exist_ok=True)
+
+        partial = f"{self.path(key, part)}.{os.getpid()}"
+        with open(partial, "w") as f:
+            json.dump(str(answer), f)
+        os.replace(partial, self.path(key, part))
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class PreparedStore:
+    """
+    Pickled input of a day, as it comes out of `prepare` (or `load_input`
+    for days without one), under the same key as the answers. Anything
+    that does not pickle is simply not stored.
+    """
+    def __init__(self, directory = PREPARED_DIR):
+        self.directory = directory
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def get(self, key):
+        if not os.path.exists(self.path(key)):
+            return None
+
+        with open(self.path(key), "rb") as f:
+            return pickle.load(f)
+
+    def put(self, key, data):
+        os.makedirs(self.directory, exist_ok=True)
+
+        # parts running in parallel may store the same input at the same time
+        partial = f"{self.path(key)}.{os.getpid()}"
+        try:
+            with open(partial, "wb") as f:
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(partial, self.path(key))
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"not storing prepared input: {e}", file=sys.stderr)
+            os.remove(partial)
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class InputStore:
+    """
+    Puzzle inputs on disk, each next to its sha256. A day is only fetched
+    when it is missing or no longer matches its checksum, so after the
+    first run everything works offline.
+    """
+    def __init__(self, directory = INPUT_DIR):
+        self.directory = directory
+
+    def path(self, day):
+        return os.path.join(self.directory, f"{day:02d}.txt")
+
+    def checksum_path(self, day):
+        return os.path.join(self.directory, f"{day:02d}.sha256")
+
+    def valid(self, day):
+        if not (os.path.exists(self.path(day)) and os.path.exists(self.checksum_path(day))):
+            return False
+
+        with open(self.checksum_path(day)) as f:
+            return f.read().strip() == file_digest(self.path(day)).hex()
+
+    def fetch(self, day):
+        # only needed on a miss, and it wants a session token
+        from aocd import get_data
+
+        data = get_data(day=day, year=YEAR)
+
+        os.makedirs(self.directory, exist_ok=True)
+        partial = f"{self.path(day)}.{os.getpid()}"
+        with open(partial, "w") as f:
+            f.write(data.rstrip("\n") + "\n")
+        os.replace(partial, self.path(day))
+
+        with open(self.checksum_path(day), "w") as f:
+            f.write(file_digest(self.path(day)).hex() + "\n")
+
+    def get(self, day):
+        if not self.valid(day):
+            self.fetch(day)
+        return self.path(day)
+
+
+def available_days():
+    return sorted( int(name[:2]) for name in os.listdir(SCRIPTDIR) if re.fullmatch(r"[0-9]{2}\.py", name) )
+
+
+def parse_days(spec):
+    days = set()
+    for chunk in spec.split(','):
+        m = re.fullmatch(r"([0-9]+)(?:-([0-9]+))?", chunk.strip())
+        if not m:
+            raise ValueError(f"could not make sense of day `{chunk}`")
+
+        first = int(m.group(1))
+        last = int(m.group(2) or first)
+        days.update(range(first, last + 1))
+
+    return [ day for day in available_days() if day in days ]
+
+
+def input_file(day, source = None):
+    if source is None or source == "example":
+        return os.path.join(SCRIPTDIR, f"{day:02d}-example.txt")
+
+    if source == "input":
+        return InputStore().path(day)
+
+    return source.format(day=f"{day:02d}")
+
+
+def load_day(day):
+    if SCRIPTDIR not in sys.path:
+        sys.path.insert(0, SCRIPTDIR)
+
+    return importlib.import_module(f"{day:02d}")
+
+
+def timed(func, *args):
+    wall = perf_counter()
+    cpu = process_time()
+
+    result = func(*args)
+
+    return result, perf_counter() - wall, process_time() - cpu
+
+
+def solve_part(module, solver, data):
+    if getattr(module, 'PER_LINE', False):
+        return ", ".join( str(solver(record)) for record in data )
+    return solver(data)
+
+
+def solve_main(module, files):
+    output = io.StringIO()
+    with redirect_stdout(output):
+        module.main(files)
+
+    return " | ".join( answer for _, answer in PART_LINE.findall(output.getvalue()) )
+
+
+def has_parts(module):
+    # some days only know how to solve both parts in one go
+    return hasattr(module, 'part_one')
+
+
+def day_parts(module):
+    if has_parts(module):
+        return ["1", "2"]
+    return ["main"]
+
+
+def prepare_input(day, module, files, key = None, store = None):
+    """
+    Load the input and, when the day has one, run its `prepare` on it, so
+    both parts get the same structure without building it twice.
+    """
+    if store is not None:
+        data, wall, cpu = timed(store.get, key)
+        if data is not None:
+            return data, [Timing(day, "prep", wall, cpu, cached=True)]
+
+    metrics.reset()
+    data, wall, cpu = timed(module.load_input, files)
+    timings = [Timing(day, "load", wall, cpu, metrics=metrics.snapshot())]
+
+    if hasattr(module, 'prepare'):
+        metrics.reset()
+        data, wall, cpu = timed(module.prepare, data)
+        timings.append(Timing(day, "prep", wall, cpu, metrics=metrics.snapshot()))
+
+    if store is not None:
+        store.put(key, data)
+
+    return data, timings
+
+
+def solve_timed(day, part, func, *args):
+    metrics.reset()
+    answer, wall, cpu = timed(profile, f"{day:02d}-{part}", func, *args)
+    return Timing(day, part, wall, cpu, answer, metrics.snapshot())
+
+
+def lookup(cache, module, files):
+    key = source_key(module, files)
+    return key, cache.get(key) if cache is not None else {}
+
+
+def lookup_timed(cache, store, module, files):
+    if cache is None and store is None:
+        return None, {}, 0, 0
+
+    (key, answers), wall, cpu = timed(lookup, cache, module, files)
+    return key, answers, wall, cpu
+
+
+def solve_cached(day, part, cache, key, func, *args):
+    timing = solve_timed(day, part, func, *args)
+    if cache is not None:
+        cache.put(key, part, timing.answer)
+    return timing
+
+
+def run_day(day, source = None, cache = None, store = None):
+    module = load_day(day)
+    files = [input_file(day, source)]
+
+    key, answers, wall, cpu = lookup_timed(cache, store, module, files)
+    for part in day_parts(module):
+        if part in answers:
+            yield Timing(day, part, wall, cpu, answers[part], cached=True)
+
+    if all( part in answers for part in day_parts(module) ):
+        return
+
+    if not has_parts(module):
+        yield solve_cached(day, "main", cache, key, solve_main, module, files)
+        return
+
+    data, timings = prepare_input(day, module, files, key, store)
+    yield from timings
+
+    for part, solver in (("1", module.part_one), ("2", module.part_two)):
+        if part not in answers:
+            yield solve_cached(day, part, cache, key, solve_part, module, solver, data)
+
+
+def run_part(day, part, source = None, cache = None, store = None):
+    module = load_day(day)
+    files = [input_file(day, source)]
+
+    key, answers, wall, cpu = lookup_timed(cache, store, module, files)
+    if part in answers:
+        return [Timing(day, part, wall, cpu, answers[part], cached=True)]
+
+    if part == "main":
+        return [solve_cached(day, part, cache, key, solve_main, module, files)]
+
+    data, timings = prepare_input(day, module, files, key, store)
+
+    solver = module.part_one if part == "1" else module.part_two
+    return timings + [solve_cached(day, part, cache, key, solve_part, module, solver, data)]
+
+
+def write_metrics(directory, day, source, timings):
+    path = input_file(day, source)
+    report = {
+            "day": day,
+            "input": path,
+            "input_bytes": os.path.getsize(path),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "parts": { timing.part: timing.metrics for timing in timings if timing.metrics is not None },
+            }
+
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"{day:02d}.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def run_sequential(days, source, metrics_dir = None, cache = None, store = None):
+    failed = []
+
+    for day in days:
+        timings = []
+        try:
+            for timing in run_day(day, source, cache, store):
+                print(timing, flush=True)
+                timings.append(timing)
+        except Exception as e:
+            print(f"{day:02d} failed: {e!r}", file=sys.stderr)
+            failed.append(day)
+
+        if metrics_dir:
+            write_metrics(metrics_dir, day, source, timings)
+
+    return failed
+
+
+def run_parallel(days, source, workers, metrics_dir = None, cache = None, store = None):
+    failed = []
+    jobs = []
+
+    for day in days:
+        try:
+            jobs += [ (day, part) for part in day_parts(load_day(day)) ]
+        except Exception as e:
+            print(f"{day:02d} failed: {e!r}", file=sys.stderr)
+            failed.append(day)
+
+    def slow_first(job):
+        day, _ = job
+        return (day not in SLOW_DAYS, day)
+
+    with ProcessPoolExecutor(workers) as pool:
+        futures = { job: pool.submit(run_part, *job, source, cache, store) for job in sorted(jobs, key=slow_first) }
+
+        # wait on the jobs in day order so the output does not depend on who finishes first
+        timings = defaultdict(list)
+        for day, part in jobs:
+            try:
+                for timing in futures[(day, part)].result():
+                    # every part parses on its own, only report the first one
+                    if timing.part in ("load", "prep") and part != "1":
+                        continue
+                    print(timing, flush=True)
+                    timings[day].append(timing)
+            except Exception as e:
+                print(f"{day:02d} part {part} failed: {e!r}", file=sys.stderr)
+                failed.append(day)
+
+    if metrics_dir:
+        for day, day_timings in timings.items():
+            write_metrics(metrics_dir, day, source, day_timings)
+
+    return failed
+
+
+def store_inputs(days):
+    """the days whose input is in the store, fetching what is missing"""
+    inputs = InputStore()
+    stored = []
+    for day in days:
+        try:
+            inputs.get(day)
+            stored.append(day)
+        except Exception as e:
+            print(f"{day:02d} could not fetch input: {e!r}", file=sys.stderr)
+    return stored
+
+
+def run(days, source = None, workers = None, metrics_dir = None, cache = None, store = None):
+    start = perf_counter()
+
+    if source == "input":
+        days = store_inputs(days)
+
+    available = []
+    for day in days:
+        if os.path.exists(input_file(day, source)):
+            available.append(day)
+        else:
+            print(f"{day:02d} skipped: no input at {input_file(day, source)}", file=sys.stderr)
+
+    if metrics_dir:
+        metrics.enabled = True
+
+    if workers:
+        failed = run_parallel(available, source, workers, metrics_dir, cache, store)
+    else:
+        failed = run_sequential(available, source, metrics_dir, cache, store)
+
+    print(f"total {(perf_counter() - start) * 1000:.3f}ms for {len(days)} days")
+
+    return len(failed) == 0
+
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(prog="aoc", description="Advent of Code 2021 solutions")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_cmd = commands.add_parser("run", help="solve several days in a single process")
+    run_cmd.add_argument("days", nargs="?", default="1-25", help="days to run, e.g. `01-24` or `1,3,5-7`")
+    run_cmd.add_argument("-i", "--input", default="example",
+            help="`example`, `input` for the local input store, or a path template like `inputs/{day}.txt`")
+    run_cmd.add_argument("-j", "--parallel", nargs="?", type=int, const=0, default=None, metavar="WORKERS",
+            help="solve every day and part in its own worker process (default: one per available cpu)")
+    run_cmd.add_argument("-m", "--metrics", metavar="DIR", help="write the metrics of every day to `DIR/NN.json`")
+    run_cmd.add_argument("--no-cache", action="store_true", help="solve again instead of using cached answers")
+    run_cmd.add_argument("--clear-cache", action="store_true",
+            help="throw away every cached answer and prepared input first")
+    run_cmd.add_argument("-p", "--keep-prepared", action="store_true",
+            help="pickle the prepared input so later runs skip parsing it")
+
+    input_cmd = commands.add_parser("input", help="print where a day's input is stored, fetching it when needed")
+    input_cmd.add_argument("day", type=int)
+
+    bench_cmd = commands.add_parser("bench", help="benchmark days and compare against a baseline")
+    bench_cmd.add_argument("days", nargs="?", default="1-25", help="days to benchmark, e.g. `01-24` or `1,3,5-7`")
+    bench_cmd.add_argument("-I", "--inputs", action="append",
+            help="directory with `NN.txt` or `NN-*.txt` inputs (default: the examples)")
+    bench_cmd.add_argument("-w", "--warmup", type=int, default=1, help="untimed runs before measuring")
+    bench_cmd.add_argument("-r", "--repeat", type=int, default=5, help="timed runs per benchmark")
+    bench_cmd.add_argument("-o", "--output", default="bench-results.json", help="where to write the results")
+    bench_cmd.add_argument("-b", "--baseline", default="bench-baseline.json", help="results to compare against")
+    bench_cmd.add_argument("-t", "--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    bench_cmd.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    bench_cmd.add_argument("--import-budget", type=float, metavar="MS",
+            help="fail when a day takes longer than this to import (default: 50ms)")
+
+    gen_cmd = commands.add_parser("gen", help="write seeded synthetic inputs")
+    gen_cmd.add_argument("days", nargs="?", default="1-25", help="days to generate for, e.g. `01-24` or `1,3,5-7`")
+    gen_cmd.add_argument("-s", "--size", type=int, action="append",
+            help="size of the input, may be repeated (default: about the size of a real input)")
+    gen_cmd.add_argument("--seed", type=int, default=0, help="seed for the random generator")
+    gen_cmd.add_argument("-o", "--output", default=os.path.join(SCRIPTDIR, "generated"),
+            help="directory to write `NN-genSIZE.txt` files to")
+
+    args = parser.parse_args(argv)
+
+    match args.command:
+        case "run":
+            workers = args.parallel
+            if workers == 0:
+                workers = cpu_count()
+
+            # profiles and metrics are only any good when the work is actually done
+            profiling = not disabled(os.environ.get('PROFILE', ""))
+            cache = AnswerCache(read=not (args.no_cache or args.metrics or profiling))
+            store = PreparedStore() if args.keep_prepared else None
+            if args.clear_cache:
+                cache.clear()
+                PreparedStore().clear()
+
+            return 0 if run(parse_days(args.days), args.input, workers, args.metrics, cache, store) else 1
+        case "input":
+            try:
+                print(InputStore().get(args.day))
+            except Exception as e:
+                print(f"{args.day:02d} could not fetch input: {e!r}", file=sys.stderr)
+                return 1
+            return 0
+        case "bench":
+            import bench
+
+            days = parse_days(args.days)
+            results = bench.benchmark(days, args.inputs, args.warmup, args.repeat)
+            bench.write_results(results, args.output)
+
+            budget = bench.IMPORT_BUDGET if args.import_budget is None else args.import_budget / 1000
+            failed = bool(bench.over_budget(results, budget) or results["failures"])
+
+            if args.save_baseline:
+                bench.write_results(results, args.baseline)
+                return 1 if failed else 0
+
+            if not os.path.exists(args.baseline):
+                print(f"no baseline at {args.baseline}, use --save-baseline to create one", file=sys.stderr)
+                return 1 if failed else 0
+
+            baseline = bench.read_results(args.baseline)
+            regressions = bench.compare(results, baseline, args.tolerance)
+            gone = bench.missing(results, baseline, set(days))
+            return 1 if regressions or gone or failed else 0
+        case "gen":
+            import generate
+
+            for day in parse_days(args.days):
+                if day not in generate.GENERATORS:
+                    continue
+                for size in args.size or [None]:
+                    path = generate.write_input(day, size, args.seed,
+                            generate.generated_file(day, size or generate.GENERATORS[day][1], args.output))
+                    print(path)
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+
+import compileall
+import glob
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+
+from datetime import datetime
+
+from aoc import SCRIPTDIR, load_day, has_parts, solve_main, solve_part, timed
+from common import color
+
+
+IMPORT_LINE = re.compile(r"^import time:\s*[0-9]+\s*\|\s*([0-9]+)\s*\|\s*(\S+)\s*$", re.MULTILINE)
+
+# no day should take longer than this to import, in seconds; the baseline
+# comparison catches the cheap days drifting within it
+IMPORT_BUDGET = 0.050
+
+
+def bench_inputs(day, dirs = None):
+    if not dirs:
+        dirs = [SCRIPTDIR]
+
+    found = []
+    for d in dirs:
+        found += glob.glob(os.path.join(d, f"{day:02d}.txt"))
+        found += glob.glob(os.path.join(d, f"{day:02d}-*.txt"))
+
+    return sorted(found)
+
+
+def summarize(samples):
+    return {
+            "min": min(samples),
+            "median": statistics.median(samples),
+            "mean": statistics.mean(samples),
+            }
+
+
+def measure(func, *args, warmup = 1, repeat = 5):
+    for _ in range(warmup):
+        func(*args)
+
+    walls = []
+    cpus = []
+    result = None
+    for _ in range(repeat):
+        result, wall, cpu = timed(func, *args)
+        walls.append(wall)
+        cpus.append(cpu)
+
+    return result, {"wall": summarize(walls), "cpu": summarize(cpus), "runs": repeat}
+
+
+def import_time(day):
+    """
+    Cumulative time to import the day in a fresh interpreter, as reported
+    by `-X importtime`.
+    """
+    name = f"{day:02d}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"__import__('{name}')"],
+            cwd=SCRIPTDIR, capture_output=True, text=True, check=True)
+
+    for micros, module in IMPORT_LINE.findall(result.stderr):
+        if module == name:
+            return int(micros) / 1e6
+
+    raise ValueError(f"no import time for {name} in the output of -X importtime")
+
+
+def bench_import(day, warmup = 1, repeat = 5):
+    # stale bytecode would turn this into a benchmark of the compiler
+    compileall.compile_dir(SCRIPTDIR, maxlevels=0, quiet=1)
+
+    for _ in range(warmup):
+        import_time(day)
+
+    samples = [ import_time(day) for _ in range(repeat) ]
+    return f"{day:02d}:import", {"wall": summarize(samples), "runs": repeat}
+
+
+def bench_day(day, path, warmup = 1, repeat = 5):
+    module = load_day(day)
+    files = [path]
+    name = os.path.basename(path)
+
+    if not has_parts(module):
+        answer, stats = measure(solve_main, module, files, warmup=warmup, repeat=repeat)
+        yield f"{day:02d}:{name}:main", dict(stats, answer=str(answer))
+        return
+
+    data, stats = measure(module.load_input, files, warmup=warmup, repeat=repeat)
+    yield f"{day:02d}:{name}:load", stats
+
+    if hasattr(module, 'prepare'):
+        data, stats = measure(module.prepare, data, warmup=warmup, repeat=repeat)
+        yield f"{day:02d}:{name}:prep", stats
+
+    for part, solver in (("1", module.part_one), ("2", module.part_two)):
+        answer, stats = measure(solve_part, module, solver, data, warmup=warmup, repeat=repeat)
+        yield f"{day:02d}:{name}:{part}", dict(stats, answer=str(answer))
+
+
+def benchmark(days, dirs = None, warmup = 1, repeat = 5):
+    """
+    Benchmark every day on every input. A day or input that raises is
+    recorded under "failures" with its error, next to the results.
+    """
+    results = {}
+    failures = {}
+
+    for day in days:
+        try:
+            key, stats = bench_import(day, warmup, repeat)
+            results[key] = stats
+            print(f"{key:<40} {stats['wall']['min'] * 1000:12.3f}ms", flush=True)
+        except Exception as e:
+            failures[f"{day:02d}:import"] = repr(e)
+            print(f"{color.RED}{day:02d} import failed: {e!r}{color.END}", file=sys.stderr)
+
+        for path in bench_inputs(day, dirs):
+            try:
+                for key, stats in bench_day(day, path, warmup, repeat):
+                    results[key] = stats
+                    print(f"{key:<40} {stats['wall']['min'] * 1000:12.3f}ms", flush=True)
+            except Exception as e:
+                failures[f"{day:02d}:{os.path.basename(path)}"] = repr(e)
+                print(f"{color.RED}{day:02d}:{os.path.basename(path)} failed: {e!r}{color.END}", file=sys.stderr)
+
+    return {
+            "meta": {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "warmup": warmup,
+                "repeat": repeat,
+                },
+            "results": results,
+            "failures": failures,
+            }
+
+
+def compare(current, baseline, tolerance = 0.25, min_delta = 0.001):
+    """
+    Compare the fastest wall time of every benchmark that appears in both
+    runs. A benchmark regresses when it got slower by more than `tolerance`
+    (relative) *and* by more than `min_delta` seconds, so microsecond noise
+    on the tiny example inputs does not trip the alarm.
+    """
+    regressions = []
+
+    for key, stats in current["results"].items():
+        if key not in baseline["results"]:
+            continue
+
+        old = baseline["results"][key]["wall"]["min"]
+        new = stats["wall"]["min"]
+
+        if new - old > min_delta and new > old * (1 + tolerance):
+            regressions.append((key, old, new))
+
+        old_answer = baseline["results"][key].get("answer")
+        if old_answer is not None and old_answer != stats.get("answer"):
+            print(f"{color.YELLOW}{key}: answer changed from {old_answer} to {stats.get('answer')}{color.END}")
+
+    for key, old, new in regressions:
+        print(f"{color.RED}{color.BOLD}REGRESSION{color.END} {key}: {old * 1000:.3f}ms -> {new * 1000:.3f}ms ({new / old:.2f}x)")
+
+    return regressions
+
+
+def missing(current, baseline, days = None):
+    """
+    benchmarks of the baseline that the current run did not produce, for
+    the `days` that were run (default: all of them)
+    """
+    gone = []
+
+    for key in baseline["results"]:
+        if key in current["results"]:
+            continue
+        if days is not None and int(key.split(":")[0]) not in days:
+            continue
+        gone.append(key)
+        print(f"{color.RED}{color.BOLD}MISSING{color.END} {key}: in the baseline but not in this run")
+
+    return gone
+
+
+def over_budget(results, budget = IMPORT_BUDGET):
+    """days whose fastest import took longer than `budget` seconds"""
+    over = []
+
+    for key, stats in results["results"].items():
+        if key.endswith(":import") and stats["wall"]["min"] > budget:
+            over.append(key)
+            print(f"{color.RED}{color.BOLD}OVER BUDGET{color.END} {key}: "
+                    f"{stats['wall']['min'] * 1000:.3f}ms > {budget * 1000:.3f}ms")
+
+    return over
+
+
+def write_results(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def read_results(path):
+    with open(path) as f:
+        return json.load(f)
@@ -1,50 +1,246 @@
 #!/usr/bin/env python3
 
-import fileinput
+# every day imports this module, so anything slow to import is only
+# imported by the function that needs it
 import os
+import sys
 
-from collections import Counter
-from dataclasses import dataclass
-from typing import List
+from array import array
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from itertools import chain, compress, product, repeat
+from time import perf_counter
+
+
+def disabled(value):
+    return value.lower() in ('', 'false', 'no', 'f', 'n', '0', 'd', 'disabled')
 
 
 def debug(value=None):
     dbg = os.environ.get('DEBUG', "false")
-    if dbg.lower() in ('false', 'no', 'f', 'n', '0', 'd', 'disabled'):
+    if disabled(dbg):
         return False
     if value:
         print(value)
     return True
 
 
-@dataclass(frozen=True)
+def _sample(func, args, interval):
+    import signal
+
+    stacks = Counter()
+    top = sys._getframe()
+
+    def sample(signum, frame):
+        stack = []
+        # only keep what happens below this profiler
+        while frame is not None and frame is not top:
+            stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+            frame = frame.f_back
+        stacks[";".join(reversed(stack))] += 1
+
+    previous = signal.signal(signal.SIGPROF, sample)
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+    try:
+        result = func(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, previous)
+
+    return result, stacks
+
+
+def profile(name, func, *args):
+    """call `func(*args)` under the PROFILE profiler and save its stats in PROFILE_DIR"""
+    mode = os.environ.get('PROFILE', "").lower()
+    if disabled(mode):
+        return func(*args)
+
+    directory = os.environ.get('PROFILE_DIR', "profiles")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+
+    match mode:
+        case 'cprofile':
+            import cProfile
+
+            profiler = cProfile.Profile()
+            result = profiler.runcall(func, *args)
+            profiler.dump_stats(f"{path}.prof")
+            path += ".prof"
+
+        case 'tracemalloc':
+            import tracemalloc
+
+            tracemalloc.start(int(os.environ.get('PROFILE_FRAMES', "1")))
+            try:
+                result = func(*args)
+                snapshot = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+            snapshot.dump(f"{path}.tracemalloc")
+            with open(f"{path}.txt", "w") as f:
+                print(f"peak: {peak:,} bytes", file=f)
+                for stat in snapshot.statistics('lineno')[:50]:
+                    print(stat, file=f)
+            path += ".tracemalloc"
+
+        case 'sample':
+            interval = float(os.environ.get('PROFILE_INTERVAL', "0.001"))
+            result, stacks = _sample(func, args, interval)
+            with open(f"{path}.folded", "w") as f:
+                for stack, count in stacks.most_common():
+                    print(f"{stack} {count}", file=f)
+            path += ".folded"
+
+        case _:
+            raise ValueError(f"unknown profiler `{mode}`, expected cprofile, tracemalloc or sample")
+
+    print(f"{color.FAINT}profile written to {path}{color.END}", file=sys.stderr)
+    return result
+
+
+class Metrics:
+    """named counters, maxima, timers and histograms; updates return at once while disabled"""
+    def __init__(self, enabled = False):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        self.counters = Counter()
+        self.maxima = {}
+        self.timers = defaultdict(float)
+        self.histograms = defaultdict(Counter)
+
+    def count(self, name, n = 1):
+        if self.enabled:
+            self.counters[name] += n
+
+    def maximum(self, name, value):
+        if self.enabled and value > self.maxima.get(name, value - 1):
+            self.maxima[name] = value
+
+    def observe(self, name, value):
+        if self.enabled:
+            self.histograms[name][1 << int(value).bit_length()] += 1
+
+    @contextmanager
+    def timer(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.timers[name] += perf_counter() - start
+
+    def snapshot(self):
+        if not self.enabled:
+            return None
+
+        return {
+                "counters": dict(self.counters),
+                "maxima": dict(self.maxima),
+                "timers": dict(self.timers),
+                "histograms": { name: dict(sorted(hist.items())) for name, hist in self.histograms.items() },
+                }
+
+    def merge(self, snapshot):
+        if not self.enabled or snapshot is None:
+            return
+
+        self.counters.update(snapshot["counters"])
+        for name, value in snapshot["maxima"].items():
+            self.maximum(name, value)
+        for name, value in snapshot["timers"].items():
+            self.timers[name] += value
+        for name, hist in snapshot["histograms"].items():
+            self.histograms[name].update(hist)
+
+
+metrics = Metrics(not disabled(os.environ.get('METRICS', "false")))
+
+
+class Progress:
+    """status line on stderr, redrawn at most every `interval` seconds; ask `due()` first"""
+    def __init__(self, interval = 0.1, stream = None):
+        self.stream = sys.stderr if stream is None else stream
+        self.active = self.stream.isatty()
+        self.interval = interval
+        self._next = 0
+        self._shown = False
+
+    def due(self):
+        return self.active and perf_counter() >= self._next
+
+    def show(self, message):
+        if not self.due():
+            return
+
+        self._next = perf_counter() + self.interval
+        self._shown = True
+        self.stream.write(f"\r{message}\033[K")
+        self.stream.flush()
+
+    def done(self):
+        if self._shown:
+            self.stream.write("\r\033[K")
+            self.stream.flush()
+            self._shown = False
+
+
 class Point:
-    x: int
-    y: int
+    # not a dataclass: importing dataclasses costs more than most days take
+    # to start. Points are mostly dict keys, so the hash is kept
+    __slots__ = ('x', 'y', '_hash')
+    __match_args__ = ('x', 'y')
+
+    def __init__(self, x, y):
+        _set_x(self, x)
+        _set_y(self, y)
+        _set_hash(self, hash((x, y)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field '{name}'")
+
+    def __reduce__(self):
+        return (self.__class__, (self.x, self.y))
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
+    def __hash__(self):
+        return self._hash
 
     def subtract(self, other):
+        if other.__class__ is Point:
+            return Point(self.x - other.x, self.y - other.y)
+
         match other:
-            case Point(x, y):
-                return Point(self.x - x, self.y - y)
             case (x, y):
                 return Point(self.x - x, self.y - y)
             case _:
                 raise ValueError(f"other is not a Point or tuple (got {type(other)})")
 
-    def __sub__(self, other):
-        return self.subtract(other)
+    __sub__ = subtract
 
     def add(self, other):
+        if other.__class__ is Point:
+            return Point(self.x + other.x, self.y + other.y)
+
         match other:
-            case Point(x, y):
-                return Point(self.x + x, self.y + y)
             case (x, y):
                 return Point(self.x + x, self.y + y)
             case _:
                 raise ValueError(f"other is not a Point or tuple (got {type(other)})")
 
-    def __add__(self, other):
-        return self.add(other)
+    __add__ = add
 
     def mag(self):
         return abs(self.x) + abs(self.y)
@@ -56,20 +252,354 @@ class Point:
         return f"({self.x},{self.y})"
 
 
-@dataclass(frozen=True)
+# the slots themselves, since Point refuses plain assignment
+_set_x = Point.x.__set__
+_set_y = Point.y.__set__
+_set_hash = Point._hash.__set__
+
+
+class PointArray:
+    """points as two parallel integer arrays; change it through `append` only"""
+    __slots__ = ('xs', 'ys', '_index')
+
+    def __init__(self, xs = (), ys = ()):
+        self.xs = array('q', xs)
+        self.ys = array('q', ys)
+        self._index = None
+
+        if len(self.xs) != len(self.ys):
+            raise ValueError(f"got {len(self.xs)} x and {len(self.ys)} y coordinates")
+
+    @classmethod
+    def from_points(cls, points):
+        xs = array('q')
+        ys = array('q')
+        for point in points:
+            xs.append(point.x)
+            ys.append(point.y)
+        return cls(xs, ys)
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        xs = array('q')
+        ys = array('q')
+        for x, y in pairs:
+            xs.append(x)
+            ys.append(y)
+        return cls(xs, ys)
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __getitem__(self, i):
+        return Point(self.xs[i], self.ys[i])
+
+    def __iter__(self):
+        return map(Point, self.xs, self.ys)
+
+    def __repr__(self):
+        return f"PointArray({len(self)} points)"
+
+    def pairs(self):
+        return zip(self.xs, self.ys)
+
+    def append(self, point):
+        self.xs.append(point.x)
+        self.ys.append(point.y)
+        self._index = None
+
+    def translate(self, offset):
+        """move every point by `offset`, or point by point by the offsets in a PointArray"""
+        match offset:
+            case PointArray(xs=dxs, ys=dys):
+                return PointArray([ x + dx for x, dx in zip(self.xs, dxs) ], [ y + dy for y, dy in zip(self.ys, dys) ])
+            case Point(dx, dy) | (dx, dy):
+                return PointArray([ x + dx for x in self.xs ], [ y + dy for y in self.ys ])
+            case _:
+                raise ValueError(f"offset is not a Point or tuple (got {type(offset)})")
+
+    def compress(self, selectors):
+        """the points whose selector is true, in the same order"""
+        return PointArray(compress(self.xs, selectors), compress(self.ys, selectors))
+
+    def reflect(self, x = None, y = None):
+        """mirror the points beyond the line at `x` (or `y`) onto the other side of it"""
+        xs = self.xs if x is None else [ 2 * x - px if px > x else px for px in self.xs ]
+        ys = self.ys if y is None else [ 2 * y - py if py > y else py for py in self.ys ]
+        return PointArray(xs, ys)
+
+    def unique(self):
+        return PointArray.from_pairs(dict.fromkeys(self.pairs()))
+
+    def bounds(self):
+        """the lowest and highest corner of the box around every point"""
+        return Point(min(self.xs), min(self.ys)), Point(max(self.xs), max(self.ys))
+
+    def index(self):
+        if self._index is None:
+            self._index = set(self.pairs())
+        return self._index
+
+    def __contains__(self, point):
+        match point:
+            case Point(x, y) | (x, y):
+                return (x, y) in self.index()
+            case _:
+                return False
+
+
 class Area:
-    x: range
-    y: range
+    """rectangle of whole coordinates, its cells numbered row by row"""
+    __slots__ = ('x', 'y', '_x0', '_x1', '_y0', '_y1')
+    __match_args__ = ('x', 'y')
+
+    def __init__(self, x, y):
+        if x.step != 1 or y.step != 1:
+            raise ValueError(f"area ranges need a step of 1 (got {x.step} and {y.step})")
+
+        _area_set['x'](self, x)
+        _area_set['y'](self, y)
+        # inclusive bounds, empty ranges end before they start
+        _area_set['_x0'](self, x.start)
+        _area_set['_x1'](self, x.stop - 1)
+        _area_set['_y0'](self, y.start)
+        _area_set['_y1'](self, y.stop - 1)
+
+    @classmethod
+    def bounding(cls, points):
+        """the smallest area holding every one of `points`, a PointArray or any iterable of Points"""
+        if not isinstance(points, PointArray):
+            points = PointArray.from_points(points)
+
+        low, high = points.bounds()
+        return cls(range(low.x, high.x + 1), range(low.y, high.y + 1))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field '{name}'")
+
+    def __reduce__(self):
+        return (self.__class__, (self.x, self.y))
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.x, self.y) == (other.x, other.y)
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    def __repr__(self):
+        return f"Area(x={self.x!r}, y={self.y!r})"
+
+    @property
+    def width(self):
+        return len(self.x)
+
+    @property
+    def height(self):
+        return len(self.y)
+
+    def __len__(self):
+        return len(self.x) * len(self.y)
 
     def __contains__(self, pos):
+        if pos.__class__ is Point:
+            return self._x0 <= pos.x <= self._x1 and self._y0 <= pos.y <= self._y1
+
         match pos:
-            case Point(x, y) | (x, y) | [x, y]:
-                return x in self.x and y in self.y
+            case (x, y) | [x, y]:
+                return self._x0 <= x <= self._x1 and self._y0 <= y <= self._y1
             case _:
                 return False
 
+    def contains(self, points):
+        """for every point of the PointArray, whether it lies in the area"""
+        x0, x1, y0, y1 = self._x0, self._x1, self._y0, self._y1
+        return bytearray( x0 <= x <= x1 and y0 <= y <= y1 for x, y in zip(points.xs, points.ys) )
+
+    def clip(self, points):
+        """the points of the PointArray that lie in the area"""
+        return points.compress(self.contains(points))
+
+    def intersection(self, other):
+        """the part of both areas, empty when they do not overlap"""
+        x0 = max(self._x0, other._x0)
+        y0 = max(self._y0, other._y0)
+        x1 = max(min(self._x1, other._x1), x0 - 1)
+        y1 = max(min(self._y1, other._y1), y0 - 1)
+        return Area(range(x0, x1 + 1), range(y0, y1 + 1))
+
+    def union(self, other):
+        """the smallest area that holds both"""
+        if not self:
+            return other
+        if not other:
+            return self
+
+        return Area(
+                range(min(self._x0, other._x0), max(self._x1, other._x1) + 1),
+                range(min(self._y0, other._y0), max(self._y1, other._y1) + 1),
+                )
+
+    def grow(self, n = 1):
+        """the area with `n` more cells on every side"""
+        return Area(range(self._x0 - n, self._x1 + n + 1), range(self._y0 - n, self._y1 + n + 1))
+
     def __iter__(self):
-        return map(lambda pos: Point(*pos), product(self.x, self.y))
+        # row by row, the same order as `index` and `point`
+        return ( Point(x, y) for y, x in product(self.y, self.x) )
+
+    def indices(self):
+        return range(len(self))
+
+    def index(self, pos):
+        """number of the cell at `pos`, counting row by row from the lowest corner"""
+        return (pos.y - self._y0) * len(self.x) + (pos.x - self._x0)
+
+    def point(self, index):
+        y, x = divmod(index, len(self.x))
+        return Point(self._x0 + x, self._y0 + y)
+
+
+_area_set = { name: getattr(Area, name).__set__ for name in Area.__slots__ }
+
+
+# steps to the cells around a cell, in the same order `neejbers` uses
+_STRAIGHT = ((0, -1), (-1, 0), (1, 0), (0, 1))
+_DIAGONAL = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+class Grid2D:
+    """integers in one flat array, row after row: (x, y) is `cells[y * width + x]`"""
+    __slots__ = ('width', 'height', 'cells', '_neighbours')
+
+    def __init__(self, width, height, fill = 0, typecode = 'q'):
+        self.width = width
+        self.height = height
+        self.cells = array(typecode, [fill]) * (width * height)
+        self._neighbours = {}
+
+    @classmethod
+    def from_rows(cls, rows, typecode = 'q'):
+        rows = [ row for row in rows if len(row) ]
+
+        grid = cls(len(rows[0]) if rows else 0, len(rows), typecode=typecode)
+        grid.cells = array(typecode, chain.from_iterable(rows))
+
+        if len(grid.cells) != grid.width * grid.height:
+            raise ValueError("rows of a grid need to have the same length")
+
+        return grid
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __repr__(self):
+        return f"Grid2D({self.width}x{self.height})"
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def position(self, i):
+        y, x = divmod(i, self.width)
+        return x, y
+
+    def _flat(self, pos):
+        if pos.__class__ is int:
+            return pos
+
+        match pos:
+            case Point(x, y) | (x, y):
+                if 0 <= x < self.width and 0 <= y < self.height:
+                    return y * self.width + x
+                raise IndexError(f"({x},{y}) is not on a {self.width}x{self.height} grid")
+            case _:
+                raise ValueError(f"not a cell index, Point or tuple (got {type(pos)})")
+
+    def __getitem__(self, pos):
+        return self.cells[self._flat(pos)]
+
+    def __setitem__(self, pos, value):
+        self.cells[self._flat(pos)] = value
+
+    def __contains__(self, pos):
+        match pos:
+            case Point(x, y) | (x, y):
+                return 0 <= x < self.width and 0 <= y < self.height
+            case _:
+                return False
+
+    def get(self, pos, default = None):
+        return self[pos] if pos in self else default
+
+    def area(self):
+        return Area(range(self.width), range(self.height))
+
+    def rows(self):
+        for y in range(self.height):
+            yield self.cells[y * self.width:(y + 1) * self.width]
+
+    def copy(self):
+        grid = Grid2D(self.width, self.height, typecode=self.cells.typecode)
+        grid.cells = array(self.cells.typecode, self.cells)
+        # same shape, same neighbours
+        grid._neighbours = self._neighbours
+        return grid
+
+    def padded(self, n = 1, fill = 0):
+        """the grid inside a border of `n` cells set to `fill`"""
+        grid = Grid2D(self.width + 2 * n, self.height + 2 * n, fill, self.cells.typecode)
+        for y, row in enumerate(self.rows()):
+            start = (y + n) * grid.width + n
+            grid.cells[start:start + self.width] = row
+        return grid
+
+    def at_least(self, value):
+        """flat indices of the cells holding `value` or more, in order"""
+        if self.cells.typecode != 'B':
+            return [ i for i, n in enumerate(self.cells) if n >= value ]
+
+        # byte cells can be marked and searched without a Python loop per cell
+        marks = self.cells.tobytes().translate(bytes( int(n >= value) for n in range(256) ))
+
+        found = []
+        i = marks.find(1)
+        while i != -1:
+            found.append(i)
+            i = marks.find(1, i + 1)
+        return found
+
+    def offsets(self, diagonal = False, center = False):
+        """what to add to a flat index to reach the cells around it, away from the edges"""
+        steps = _DIAGONAL if diagonal else _STRAIGHT
+        if center:
+            steps = sorted(steps + ((0, 0),), key=lambda step: (step[1], step[0]))
+        return tuple( dy * self.width + dx for dx, dy in steps )
+
+    def neighbours(self, i, diagonal = False):
+        """flat indices of the cells next to cell `i` that are on the grid"""
+        offsets, targets = self.neighbour_rows(diagonal)
+        return targets[offsets[i]:offsets[i + 1]]
+
+    def neighbour_rows(self, diagonal = False):
+        """neighbours of cell `i` as `targets[offsets[i]:offsets[i + 1]]`, built once"""
+        rows = self._neighbours.get(diagonal)
+        if rows is None:
+            rows = self._neighbours[diagonal] = self._neighbour_rows(diagonal)
+        return rows
+
+    def _neighbour_rows(self, diagonal):
+        steps = _DIAGONAL if diagonal else _STRAIGHT
+        w, h = self.width, self.height
+        offsets, targets = array('i', [0]), array('i')
+        for y in range(h):
+            for x in range(w):
+                targets.extend( (y + dy) * w + x + dx for dx, dy in steps if 0 <= x + dx < w and 0 <= y + dy < h )
+                offsets.append(len(targets))
+        return offsets, targets
 
 
 class color:
@@ -95,22 +625,205 @@ def clean(something):
 def intlist(something):
     return list(map(int, something))
 
-def combine(*funcs):
-    def comb(something):
-        for f in reversed(funcs):
+class Combined:
+    # a class rather than a closure so it can be sent to worker processes
+    def __init__(self, funcs):
+        self.funcs = funcs[::-1]
+
+    def __call__(self, something):
+        for f in self.funcs:
             something = f(something)
         return something
-    return comb
+
+def combine(*funcs):
+    return Combined(funcs)
 
 
-def read_input(transform = None):
+def read_grid(transform = None, files = None, typecode = 'q'):
+    """the input as a Grid2D, each line through `transform` (default: its digits)"""
+    if transform is None:
+        transform = combine(intlist, clean)
+
+    return Grid2D.from_rows(read_input(transform, files), typecode)
+
+
+# inputs at least this big are parsed by several processes
+PARALLEL_INPUT = 1 << 24
+
+
+def cpu_count():
+    """cpus this process may run on, or all of them where that cannot be told"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def read_input(transform = None, files = None, workers = None):
+    """every line of the input through `transform`, large inputs in a pool of `workers`"""
     if transform is None:
         transform = ident
 
-    with fileinput.input() as content:
+    if workers is None or workers > 1:
+        paths = _input_paths(files)
+        if paths and sum(map(os.path.getsize, paths)) >= PARALLEL_INPUT:
+            if workers is None:
+                workers = cpu_count()
+            if workers > 1 and _picklable(transform):
+                return _read_parallel(transform, paths, workers)
+
+    import fileinput
+
+    with fileinput.input(files) as content:
         return [ transform(line) for line in content ]
 
 
+def _input_paths(files):
+    """the paths to read when they are all regular files that can be split up"""
+    if files is None:
+        files = sys.argv[1:]
+    elif isinstance(files, str):
+        files = [files]
+
+    if not files or not all( name != '-' and os.path.isfile(name) for name in files ):
+        return None
+
+    return list(files)
+
+
+def _picklable(value):
+    import pickle
+
+    try:
+        pickle.dumps(value)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False
+    return True
+
+
+def _line_chunks(path, n):
+    """about `n` (start, end) byte ranges of `path` that each end on a line"""
+    size = os.path.getsize(path)
+    bounds = [0]
+
+    with open(path, 'rb') as f:
+        for k in range(1, n):
+            f.seek(max(size * k // n, bounds[-1]))
+            f.readline()
+            if f.tell() >= size:
+                break
+            bounds.append(f.tell())
+
+    bounds.append(size)
+    return [ (start, end) for start, end in zip(bounds, bounds[1:]) if end > start ]
+
+
+def _transform_chunk(path, start, end, transform):
+    import io
+    import locale
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    # decoded and split the same way fileinput reads text
+    text = io.StringIO(data.decode(locale.getpreferredencoding(False)), newline=None)
+    return [ transform(line) for line in text ]
+
+
+def _read_parallel(transform, paths, workers):
+    from concurrent.futures import ProcessPoolExecutor
+
+    # a few chunks per worker evens out lines that take longer to transform
+    chunks = [ (path, start, end) for path in paths for start, end in _line_chunks(path, workers * 4) ]
+
+    with ProcessPoolExecutor(workers) as pool:
+        parts = pool.map(_transform_chunk, *zip(*chunks), repeat(transform, len(chunks)))
+        return list(chain.from_iterable(parts))
+
+
+class InputStream:
+    """the input, read again on every pass; stdin is kept from the first one"""
+    def __init__(self, transform = None, files = None, buffer_size = 1 << 16):
+        if transform is None:
+            transform = ident
+
+        self.transform = transform
+        self.files = files
+        self.buffer_size = buffer_size
+        self._kept = None
+
+    def _open(self, name, mode):
+        return open(name, mode, buffering=self.buffer_size)
+
+    def _rereadable(self):
+        files = self.files
+        if files is None:
+            files = sys.argv[1:]
+        elif isinstance(files, (str, os.PathLike)):
+            files = [files]
+        return bool(files) and all( name != '-' and os.path.isfile(name) for name in files )
+
+    def _lines(self):
+        import fileinput
+
+        with fileinput.input(self.files, openhook=self._open) as content:
+            for line in content:
+                yield self.transform(line)
+
+    def __iter__(self):
+        if self._kept is not None:
+            return iter(self._kept)
+        if self._rereadable():
+            return self._lines()
+        self._kept = list(self._lines())
+        return iter(self._kept)
+
+
+def iter_input(transform = None, files = None, buffer_size = 1 << 16):
+    return InputStream(transform, files, buffer_size)
+
+
+def _extend_ints(values, name, use_mmap):
+    if name == '-':
+        values.extend(map(int, sys.stdin.buffer.read().replace(b',', b' ').split()))
+        return
+
+    with open(name, 'rb') as f:
+        if use_mmap and os.fstat(f.fileno()).st_size > 0:
+            import mmap
+            import re
+
+            # one match at a time straight into the array, so the file is
+            # never held as text or as a list of numbers
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                values.extend( int(m.group()) for m in re.finditer(rb"-?[0-9]+", mm) )
+            return
+
+        values.extend(map(int, f.read().replace(b',', b' ').split()))
+
+
+def read_ints(files = None, use_mmap = False, numpy = False):
+    """every integer in the input, split on whitespace or commas, in one array('q')"""
+    if files is None:
+        files = sys.argv[1:] or ['-']
+    elif isinstance(files, str):
+        files = [files]
+
+    values = array('q')
+    for name in files:
+        _extend_ints(values, name, use_mmap)
+
+    if numpy:
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("read_ints(numpy=True) needs NumPy, which is optional and not in requirements.txt: pip install numpy") from e
+        return np.frombuffer(values, dtype=np.int64)
+
+    return values
+
+
 def sign(value, func=None):
     if value == 0:
         return 0
@@ -159,3 +872,57 @@ def interpolate_points(start, end):
         return [ Point(x, y) for x, y in zip(range(start.x, end.x + dx, dx), range(start.y, end.y + dy, dy)) ]
 
     raise ValueError(f"line slope not supported ({diff.x}:{diff.y})")
+
+
+def _segments(starts, ends):
+    """direction and number of points of every segment"""
+    for sx, sy, ex, ey in zip(starts.xs, starts.ys, ends.xs, ends.ys):
+        dx = ex - sx
+        dy = ey - sy
+        if dx and dy and abs(dx) != abs(dy):
+            raise ValueError(f"line slope not supported ({dx}:{dy})")
+
+        yield sx, sy, sign(dx, int), sign(dy, int), max(abs(dx), abs(dy)) + 1
+
+
+def rasterise(starts, ends):
+    """every point on the segments from `starts` to `ends` as one PointArray"""
+    xs = array('q')
+    ys = array('q')
+
+    for sx, sy, dx, dy, n in _segments(starts, ends):
+        xs.extend(range(sx, sx + dx * n, dx) if dx else repeat(sx, n))
+        ys.extend(range(sy, sy + dy * n, dy) if dy else repeat(sy, n))
+
+    return PointArray(xs, ys)
+
+
+def rasterise_counts(starts, ends, area = None):
+    """how many segments cover each cell of `area`, as a dense Grid2D and that area"""
+    if area is None:
+        area = Area.bounding(starts).union(Area.bounding(ends))
+
+    try:
+        # a byte per cell is plenty, until one cell is crossed 256 times
+        return _count_segments(starts, ends, area, 'B'), area
+    except OverflowError:
+        return _count_segments(starts, ends, area, 'I'), area
+
+
+def _count_segments(starts, ends, area, typecode):
+    counts = Grid2D(area.width, area.height, typecode=typecode)
+    cells = counts.cells
+    x0, y0, width = area.x.start, area.y.start, area.width
+
+    for sx, sy, dx, dy, n in _segments(starts, ends):
+        # both ends inside means the whole straight segment is
+        ex, ey = sx + dx * (n - 1), sy + dy * (n - 1)
+        if (sx, sy) not in area or (ex, ey) not in area:
+            raise ValueError(f"segment ({sx},{sy}) -> ({ex},{ey}) leaves {area}")
+
+        start = (sy - y0) * width + (sx - x0)
+        step = dy * width + dx
+        for i in range(start, start + step * n, step) if step else (start,):
+            cells[i] += 1
+
+    return counts
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import string
+
+from itertools import permutations, product
+
+from aoc import SCRIPTDIR
+
+
+GENERATORS = {}
+
+
+def generator(day, default):
+    def register(func):
+        GENERATORS[day] = (func, default)
+        return func
+    return register
+
+
+@generator(1, default=2000)
+def depth_readings(rng, size):
+    """`size` depth readings of a slowly descending sea floor"""
+    depth = rng.randrange(100, 200)
+    for _ in range(size):
+        depth = max(0, depth + rng.randint(-10, 20))
+        yield str(depth)
+
+
+@generator(2, default=1000)
+def sub_commands(rng, size):
+    """`size` submarine commands"""
+    for _ in range(size):
+        yield f"{rng.choice(['forward', 'down', 'up'])} {rng.randint(1, 9)}"
+
+
+@generator(3, default=1000)
+def diagnostic_report(rng, size):
+    """`size` unique binary numbers, at least 12 bits wide"""
+    width = max(12, size.bit_length() + 1)
+    for value in rng.sample(range(2 ** width), size):
+        yield f"{value:0{width}b}"
+
+
+@generator(4, default=100)
+def bingo(rng, size):
+    """all numbers up to 99 drawn against `size` boards"""
+    drawn = list(range(100))
+    rng.shuffle(drawn)
+    yield ",".join(map(str, drawn))
+
+    for _ in range(size):
+        yield ""
+        numbers = rng.sample(range(100), 25)
+        for row in range(5):
+            yield " ".join(f"{n:2d}" for n in numbers[row * 5:row * 5 + 5])
+
+
+@generator(5, default=500)
+def vents(rng, size):
+    """`size` horizontal, vertical or diagonal vents on a 1000x1000 floor"""
+    n = 0
+    while n < size:
+        sx, sy = rng.randrange(1000), rng.randrange(1000)
+        length = rng.randrange(1, 500)
+        dx, dy = rng.choice([(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)])
+
+        ex = min(999, max(0, sx + dx * length))
+        ey = min(999, max(0, sy + dy * length))
+        if dx and dy:
+            # keep diagonals at exactly 45 degrees after clipping
+            length = min(abs(ex - sx), abs(ey - sy))
+            ex, ey = sx + dx * length, sy + dy * length
+
+        if (sx, sy) == (ex, ey):
+            continue
+
+        n += 1
+        yield f"{sx},{sy} -> {ex},{ey}"
+
+
+@generator(6, default=300)
+def lanternfish(rng, size):
+    """`size` lanternfish timers"""
+    yield ",".join( str(rng.randint(1, 5)) for _ in range(size) )
+
+
+@generator(7, default=1000)
+def crabs(rng, size):
+    """`size` crab positions spread over twice as many spots"""
+    yield ",".join( str(rng.randrange(2 * size)) for _ in range(size) )
+
+
+DIGIT_SEGMENTS = [ "abcefg", "cf", "acdeg", "acdfg", "bcdf", "abdfg", "abdefg", "acf", "abcdefg", "abcdfg" ]
+
+
+@generator(8, default=200)
+def seven_segment(rng, size):
+    """`size` readings, each wired with its own segment permutation"""
+    for _ in range(size):
+        wiring = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+
+        def scramble(digit):
+            segments = [ wiring[s] for s in DIGIT_SEGMENTS[digit] ]
+            rng.shuffle(segments)
+            return "".join(segments)
+
+        digits = [ scramble(d) for d in rng.sample(range(10), 10) ]
+        reading = [ scramble(rng.randrange(10)) for _ in range(4) ]
+
+        yield f"{' '.join(digits)} | {' '.join(reading)}"
+
+
+@generator(9, default=100)
+def height_map(rng, size):
+    """`size`x`size` height map with ridges of nines between the basins"""
+    for _ in range(size):
+        yield "".join( "9" if rng.random() < 0.2 else str(rng.randrange(9)) for _ in range(size) )
+
+
+CHUNKS = { "(" : ")", "[" : "]", "{" : "}", "<" : ">" }
+
+
+@generator(10, default=100)
+def navigation(rng, size):
+    """`size` lines that are either corrupted or incomplete"""
+    for _ in range(size):
+        line = []
+        context = []
+        corrupt = rng.random() < 0.5
+
+        for _ in range(rng.randrange(20, 120)):
+            if context and rng.random() < 0.45:
+                line.append(context.pop())
+            else:
+                opener = rng.choice(list(CHUNKS))
+                line.append(opener)
+                context.append(CHUNKS[opener])
+
+        if not context:
+            opener = rng.choice(list(CHUNKS))
+            line.append(opener)
+            context.append(CHUNKS[opener])
+
+        if corrupt:
+            line.append(rng.choice([ c for c in CHUNKS.values() if c != context[-1] ]))
+
+        yield "".join(line)
+
+
+@generator(11, default=10)
+def octopi(rng, size):
+    """
+    `size`x`size` energy levels; beyond about 10x10 a random grid rarely
+    ever flashes all at once, so part two may not finish on those
+    """
+    for _ in range(size):
+        yield "".join( str(rng.randrange(10)) for _ in range(size) )
+
+
+@generator(12, default=6)
+def caves(rng, size):
+    """`size` small caves hooked up to a third as many big ones, big caves never touch"""
+    small = set()
+    while len(small) < size:
+        small.add("".join(rng.choices(string.ascii_lowercase, k=2)))
+    small = sorted(small - {"start", "end"})
+
+    big = set()
+    while len(big) < max(1, size // 3):
+        big.add("".join(rng.choices(string.ascii_uppercase, k=2)))
+    big = sorted(big)
+
+    edges = set()
+    for cave in small:
+        for other in rng.sample(big, min(len(big), rng.randint(1, 2))):
+            edges.add((cave, other))
+        if rng.random() < 0.3:
+            other = rng.choice(small)
+            if other != cave:
+                edges.add((cave, other))
+
+    for node in ("start", "end"):
+        for other in rng.sample(small + big, min(len(small) + len(big), 2)):
+            edges.add((node, other))
+
+    for a, b in sorted(edges):
+        yield f"{a}-{b}"
+
+
+@generator(13, default=800)
+def transparent_paper(rng, size):
+    """`size` dots on a sheet that folds down to 40x6 in twelve folds"""
+    width, height = 40, 6
+    folds = []
+    for i in range(12):
+        if i % 2 == 0:
+            folds.append(f"fold along x={width}")
+            width = 2 * width + 1
+        else:
+            folds.append(f"fold along y={height}")
+            height = 2 * height + 1
+
+    dots = set()
+    while len(dots) < size:
+        dots.add((rng.randrange(width), rng.randrange(height)))
+
+    for x, y in dots:
+        yield f"{x},{y}"
+    yield ""
+    yield from reversed(folds)
+
+
+@generator(14, default=20)
+def polymer(rng, size):
+    """template of `size` elements with an insertion rule for every pair"""
+    elements = "BCFHKNOPSV"
+    yield "".join( rng.choice(elements) for _ in range(size) )
+    yield ""
+    for a, b in product(elements, repeat=2):
+        yield f"{a}{b} -> {rng.choice(elements)}"
+
+
+@generator(15, default=100)
+def risk_levels(rng, size):
+    """`size`x`size` risk levels"""
+    for _ in range(size):
+        yield "".join( str(rng.randint(1, 9)) for _ in range(size) )
+
+
+def packet_bits(rng, budget, depth):
+    version = f"{rng.randrange(8):03b}"
+
+    if budget <= 1 or depth >= 20 or (depth > 0 and rng.random() < 0.3):
+        value = rng.randrange(2 ** rng.randint(1, 32))
+        groups = f"{value:b}"
+        groups = "0" * (-len(groups) % 4) + groups
+        chunks = [ groups[i:i + 4] for i in range(0, len(groups), 4) ]
+        literal = "".join( ("1" if i < len(chunks) - 1 else "0") + chunk for i, chunk in enumerate(chunks) )
+        return version + "100" + literal, 1
+
+    type_id = rng.choice([0, 1, 2, 3, 5, 6, 7])
+    if type_id >= 5:
+        count = 2
+    else:
+        count = rng.randint(1, max(1, min(budget - 1, 8)))
+
+    children = []
+    used = 1
+    for i in range(count):
+        bits, n = packet_bits(rng, (budget - used) // (count - i), depth + 1)
+        children.append(bits)
+        used += n
+    body = "".join(children)
+
+    if len(body) < 2 ** 15 and rng.random() < 0.5:
+        return version + f"{type_id:03b}" + "0" + f"{len(body):015b}" + body, used
+    return version + f"{type_id:03b}" + "1" + f"{count:011b}" + body, used
+
+
+@generator(16, default=50)
+def transmission(rng, size):
+    """one transmission holding roughly `size` packets"""
+    bits, _ = packet_bits(rng, size, 0)
+    bits += "0" * (-len(bits) % 4)
+    yield "".join( f"{int(bits[i:i + 4], 2):X}" for i in range(0, len(bits), 4) )
+
+
+@generator(17, default=100)
+def target_area(rng, size):
+    """target area roughly `size` units away from the launch site"""
+    xl = rng.randint(size, 2 * size)
+    xh = xl + rng.randint(size // 10 + 1, size // 2 + 1)
+    yl = -rng.randint(size, 2 * size)
+    yh = yl + rng.randint(size // 10 + 1, size // 2 + 1)
+    yield f"target area: x={xl}..{xh}, y={yl}..{min(yh, -1)}"
+
+
+def snailfish(rng, depth):
+    if depth >= 4 or (depth > 0 and rng.random() < 0.3):
+        return str(rng.randrange(10))
+    return f"[{snailfish(rng, depth + 1)},{snailfish(rng, depth + 1)}]"
+
+
+@generator(18, default=100)
+def snailfish_numbers(rng, size):
+    """`size` reduced snailfish numbers"""
+    for _ in range(size):
+        yield snailfish(rng, 0)
+
+
+def rotations3():
+    for axes in permutations(range(3)):
+        for signs in product((1, -1), repeat=3):
+            matrix = [ [ signs[r] if c == axes[r] else 0 for c in range(3) ] for r in range(3) ]
+            a, b, c = matrix
+            det = (a[0] * (b[1] * c[2] - b[2] * c[1])
+                 - a[1] * (b[0] * c[2] - b[2] * c[0])
+                 + a[2] * (b[0] * c[1] - b[1] * c[0]))
+            if det == 1:
+                yield matrix
+
+
+@generator(19, default=10)
+def scanners(rng, size):
+    """`size` scanners, each overlapping at least twelve beacons with an earlier one"""
+    positions = [(0, 0, 0)]
+    beacons = set()
+
+    def around(pos, spread):
+        return tuple( c + rng.randint(-spread, spread) for c in pos )
+
+    for _ in range(20):
+        beacons.add(around(positions[0], 1000))
+
+    while len(positions) < size:
+        parent = rng.choice(positions)
+        offset = tuple( rng.choice((-1, 1)) * rng.randint(0, 1100) for _ in range(3) )
+        pos = tuple( p + o for p, o in zip(parent, offset) )
+
+        # make sure the overlap with the parent holds at least twelve beacons
+        low = [ max(p, q) - 1000 for p, q in zip(parent, pos) ]
+        high = [ min(p, q) + 1000 for p, q in zip(parent, pos) ]
+        for _ in range(12):
+            beacons.add(tuple( rng.randint(l, h) for l, h in zip(low, high) ))
+        for _ in range(8):
+            beacons.add(around(pos, 1000))
+
+        positions.append(pos)
+
+    rotations = list(rotations3())
+    for idx, pos in enumerate(positions):
+        yield f"--- scanner {idx} ---"
+        rot = rotations[0] if idx == 0 else rng.choice(rotations)
+        for beacon in beacons:
+            rel = [ b - p for b, p in zip(beacon, pos) ]
+            if all( abs(c) <= 1000 for c in rel ):
+                x, y, z = ( sum(m * c for m, c in zip(row, rel)) for row in rot )
+                yield f"{x},{y},{z}"
+        yield ""
+
+
+@generator(20, default=100)
+def trench_map(rng, size):
+    """random enhancement algorithm that flips the infinite background, and a `size`x`size` image"""
+    algo = [ rng.choice("#.") for _ in range(512) ]
+    algo[0], algo[-1] = "#", "."
+    yield "".join(algo)
+    yield ""
+    for _ in range(size):
+        yield "".join( rng.choice("#.") for _ in range(size) )
+
+
+@generator(21, default=2)
+def dirac_dice(rng, size):
+    """two players on random spaces, the game is fixed so `size` is ignored"""
+    for player in (1, 2):
+        yield f"Player {player} starting position: {rng.randint(1, 10)}"
+
+
+@generator(22, default=420)
+def reactor_reboot(rng, size):
+    """`size` reboot steps, the first twenty inside the initialization area and the rest outside of it"""
+    for i in range(size):
+        if i < 20:
+            spread, extent = 50, 25
+        else:
+            spread, extent = 100000, 30000
+
+        while True:
+            ranges = []
+            for _ in range(3):
+                low = rng.randint(-spread, spread - 1)
+                ranges.append((low, min(spread, low + rng.randint(1, extent))))
+
+            if i < 20 or any( high < -50 or low > 50 for low, high in ranges ):
+                break
+
+        ranges = [ f"{low}..{high}" for low, high in ranges ]
+
+        state = "on" if i < 10 or rng.random() < 0.6 else "off"
+        yield f"{state} x={ranges[0]},y={ranges[1]},z={ranges[2]}"
+
+
+# the solver for 24 hard codes how the digits of a serial relate:
+# `digit[pop] = digit[push] + difference`
+MONAD_PAIRS = [ (4, 5, 1), (6, 7, -7), (9, 10, -5), (8, 11, -3), (3, 12, -8), (2, 13, 4), (1, 14, 5) ]
+
+
+@generator(24, default=14)
+def monad(rng, size):
+    """MONAD program with fresh constants that satisfies the relations in 24, so `size` is ignored"""
+    offsets = {}
+    checks = {}
+    pops = set()
+
+    for push, pop, difference in MONAD_PAIRS:
+        offsets[push] = rng.randint(0, 16)
+        checks[push] = rng.randint(10, 16)
+        offsets[pop] = rng.randint(0, 16)
+        checks[pop] = difference - offsets[push]
+        pops.add(pop)
+
+    for digit in range(1, 15):
+        yield "inp w"
+        yield "mul x 0"
+        yield "add x z"
+        yield "mod x 26"
+        yield f"div z {26 if digit in pops else 1}"
+        yield f"add x {checks[digit]}"
+        yield "eql x w"
+        yield "eql x 0"
+        yield "mul y 0"
+        yield "add y 25"
+        yield "mul y x"
+        yield "add y 1"
+        yield "mul z y"
+        yield "mul y 0"
+        yield "add y w"
+        yield f"add y {offsets[digit]}"
+        yield "mul y x"
+        yield "add z y"
+
+
+def generated_file(day, size, directory = None):
+    if directory is None:
+        directory = os.path.join(SCRIPTDIR, "generated")
+    return os.path.join(directory, f"{day:02d}-gen{size}.txt")
+
+
+def write_input(day, size = None, seed = 0, path = None):
+    func, default = GENERATORS[day]
+    if size is None:
+        size = default
+    if path is None:
+        path = generated_file(day, size)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    rng = random.Random(f"{day}:{size}:{seed}")
+    with open(path, "w") as f:
+        for line in func(rng, size):
+            f.write(line)
+            f.write("\n")
+
+    return path
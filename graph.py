@@ -1,9 +1,17 @@
 import math
 
+from abc import ABC, abstractmethod
+
+from array import array
 from dataclasses import dataclass
-from collections import defaultdict, Counter
+from collections import defaultdict, deque
+from collections.abc import Mapping
+from heapq import heappush, heappop
+from itertools import count, pairwise
 from typing import Any
 
+from common import cpu_count
+
 
 @dataclass(frozen=True)
 class Edge:
@@ -15,10 +23,45 @@ class Edge:
         return Edge(self.end, self.start, self.cost)
 
 
+# at most this many hops are walked before splitting a path search up, into
+# about this many tasks per worker
+SPLIT_HOPS = 6
+SPLIT_TASKS = 16
+
+
+def unreachable():
+    return math.inf
+
+
+def no_edges():
+    return defaultdict(unreachable)
+
+
+class VisitPolicy(ABC):
+    """which nodes a path may enter; states must be hashable and refusals final"""
+    initial = 0
+
+    @abstractmethod
+    def enter(self, state, node, bit):
+        ...
+
+
+class SimplePaths(VisitPolicy):
+    """every node at most once"""
+
+    def enter(self, state, node, bit):
+        if state & bit:
+            return None
+        return state | bit
+
+
 class Graph:
     def __init__(self, edges):
-        self.G = defaultdict(lambda:defaultdict(lambda:math.inf))
+        # named factories rather than lambdas so a graph can be pickled
+        self.G = defaultdict(no_edges)
         self.V = set()
+        self._reaching = {}
+        self._preds = None
 
         if edges is not None:
             for edge in edges:
@@ -32,20 +75,755 @@ class Graph:
             return set()
         return set(self.G[node])
 
-    def paths_between(self, start, dest):
-        visited = Counter()
+    def cost(self, start, end):
+        """cost of the edge from `start` to `end`, or inf if there is none"""
+        if start not in self.G:
+            return math.inf
+        return self.G[start].get(end, math.inf)
+
+    def path_cost(self, path):
+        return sum( self.cost(s, e) for s, e in pairwise(path) )
+
+    def shortest_paths(self, source, dest=None, h=None):
+        """Dijkstra from `source`, or A* to `dest` with a consistent heuristic `h`"""
+        dist = {source: 0}
+        prev = {}
+        settled = set()
+        tiebreak = count()
+        heap = [(h(source) if h else 0, next(tiebreak), source)]
+
+        while heap:
+            _, _, u = heappop(heap)
+            if u in settled:
+                continue
+            settled.add(u)
+            if u == dest:
+                break
+
+            d = dist[u]
+            for v, cost in self.G.get(u, {}).items():
+                alt = d + cost
+                if alt < dist.get(v, math.inf):
+                    dist[v] = alt
+                    prev[v] = u
+                    heappush(heap, (alt + h(v) if h else alt, next(tiebreak), v))
+
+        return ShortestPaths(source, dist, prev, settled)
+
+    def shortest_path(self, start, dest, h=None):
+        """cheapest path from `start` to `dest` as a list of nodes, or None"""
+        return self.shortest_paths(start, dest, h).path(dest)
+
+    def count_paths_between(self, start, dest, policy=None):
+        """number of paths from `start` to `dest` allowed by `policy`"""
+        policy = policy or SimplePaths()
+        bits = self._bits(start)
+
+        state = policy.enter(policy.initial, start, bits[start])
+        if state is None:
+            return 0
+
+        # memoised on (node, state), on an explicit stack so depth is no limit:
+        # a frame stays until every step out of it has been counted
+        root = (start, state)
+        counts = {}
+        steps = {}
+        stack = [root]
+        while stack:
+            frame = stack[-1]
+            if frame in counts:
+                stack.pop()
+                continue
+
+            node, state = frame
+            if node == dest:
+                counts[frame] = 1
+                stack.pop()
+                continue
+
+            if frame not in steps:
+                steps[frame] = [
+                        (neejber, after)
+                        for neejber in self.neejbers(node)
+                        if (after := policy.enter(state, neejber, bits[neejber])) is not None
+                        ]
+
+            todo = [ step for step in steps[frame] if step not in counts ]
+            if todo:
+                stack.extend(todo)
+                continue
+
+            counts[frame] = sum( counts[step] for step in steps.pop(frame) )
+            stack.pop()
+
+        return counts[root]
+
+    def _bits(self, start):
+        bits = { node: 1 << i for i, node in enumerate(self.V) }
+        bits.setdefault(start, 1 << len(bits))
+        return bits
+
+    def predecessors(self):
+        """node -> set of nodes with an edge into it"""
+        if self._preds is None:
+            self._preds = defaultdict(set)
+            for u in self.G:
+                for v in self.G[u]:
+                    self._preds[v].add(u)
+        return self._preds
+
+    def reaching(self, dest, allowed=None):
+        """nodes with a path to `dest` through nodes `allowed` accepts"""
+        if allowed is None and dest in self._reaching:
+            return self._reaching[dest]
+
+        preds = self.predecessors()
+        seen = {dest}
+        todo = [dest]
+        while todo:
+            v = todo.pop()
+            for u in preds.get(v, ()):
+                if u not in seen and (allowed is None or allowed(u)):
+                    seen.add(u)
+                    todo.append(u)
+
+        if allowed is None:
+            self._reaching[dest] = seen
+        return seen
+
+    def paths_between(self, start, dest, policy=None, workers=1):
+        """every path from `start` to `dest` allowed by `policy`, as a list"""
+        return list(self._paths(start, dest, policy, workers))
+
+    def send_paths(self, start, dest, sink, policy=None, workers=1):
+        """hand every path to `sink(path)` as it is found, return how many there were"""
+        n = 0
+        for path in self._paths(start, dest, policy, workers):
+            sink(path)
+            n += 1
+        return n
+
+    def _paths(self, start, dest, policy, workers):
+        if workers is None:
+            workers = cpu_count()
+
+        if workers > 1 and _picklable(policy):
+            return self._paths_parallel(start, dest, policy or SimplePaths(), workers)
+        return self.walk_paths(start, dest, policy)
+
+    def walk_paths(self, start, dest, policy=None, tree=None):
+        """every path from `start` to `dest` allowed by `policy`, or its id in `tree`"""
+        policy = policy or SimplePaths()
+        bits = self._bits(start)
+
+        state = policy.enter(policy.initial, start, bits[start])
+        if state is None or start not in self.reaching(dest):
+            return
+
+        yield from self._walk([start], state, dest, policy, bits, tree)
+
+    def _walk(self, path, state, dest, policy, bits, tree=None, cut=None):
+        """the walk below `path`; with `cut`, the (path, state) pairs that many nodes deep"""
+        reachable = self.reaching(dest)
+        live_from = {}
+
+        def steps(node, state):
+            options = []
+            for n in self.neejbers(node):
+                if n in reachable:
+                    after = policy.enter(state, n, bits[n])
+                    if after is not None:
+                        options.append((n, after))
+            if len(options) > 1:
+                # at a fork, skip the ways on that can no longer reach dest
+                # under this state; that set is worked out once per state
+                live = live_from.get(state)
+                if live is None:
+                    live = live_from[state] = self.reaching(
+                        dest, lambda n: policy.enter(state, n, bits[n]) is not None)
+                options = [ option for option in options if option[0] in live ]
+            return iter(options)
+
+        ids = None
+        if tree is not None:
+            ids = []
+            for node in path:
+                ids.append(tree.add(ids[-1] if ids else -1, node))
+
+        if path[-1] == dest:
+            if cut is not None:
+                yield list(path), None
+            else:
+                yield ids[-1] if tree is not None else list(path)
+            return
+
+        stack = [steps(path[-1], state)]
+        while stack:
+            step = next(stack[-1], None)
+            if step is None:
+                stack.pop()
+                if stack:
+                    path.pop()
+                    if tree is not None:
+                        ids.pop()
+                continue
+
+            node, after = step
+            if tree is not None:
+                ids.append(tree.add(ids[-1], node))
+
+            if node == dest:
+                if cut is not None:
+                    yield path + [node], None
+                else:
+                    yield ids.pop() if tree is not None else path + [node]
+                continue
+
+            if cut is not None and len(path) + 1 == cut:
+                yield path + [node], after
+                continue
+
+            path.append(node)
+            stack.append(steps(node, after))
+
+    def _paths_parallel(self, start, dest, policy, workers):
+        bits = self._bits(start)
+        state = policy.enter(policy.initial, start, bits[start])
+        if state is None or start not in self.reaching(dest):
+            return
+
+        # push the cut out a hop at a time until there are plenty of subtrees
+        # per worker; paths that end above the cut stay in place as (path, None)
+        tasks = workers * SPLIT_TASKS
+        items = [([start], state)]
+        for _ in range(SPLIT_HOPS):
+            if sum( 1 for _, s in items if s is not None ) >= tasks:
+                break
+            items = [
+                    item
+                    for path, s in items
+                    for item in ([(path, s)] if s is None else self._walk(path, s, dest, policy, bits, cut=len(path) + 1))
+                    ]
+
+        if not items:
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        size = -(-len(items) // tasks)
+        groups = [ items[i:i + size] for i in range(0, len(items), size) ]
+
+        # submit a few tasks ahead rather than all of them, so finished but
+        # not yet consumed results never pile up
+        with ProcessPoolExecutor(workers, initializer=_start_walker, initargs=(self, dest, policy, bits)) as pool:
+            pending = deque()
+            for group in groups:
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+                pending.append(pool.submit(_walk_items, group))
+            while pending:
+                yield from pending.popleft().result()
+
+
+def _picklable(value):
+    import pickle
+
+    try:
+        pickle.dumps(value)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return False
+    return True
+
+
+# what a pool worker walks: (graph, dest, policy, bits), set up once per process
+_walker = None
+
+
+def _start_walker(graph, dest, policy, bits):
+    global _walker
+    _walker = (graph, dest, policy, bits)
+
+
+def _walk_items(items):
+    graph, dest, policy, bits = _walker
+    paths = []
+    for path, state in items:
+        if state is None:
+            paths.append(path)
+        else:
+            paths.extend(graph._walk(path, state, dest, policy, bits))
+    return paths
+
+
+class PrefixWriter:
+    """send_paths sink writing each path as its shared prefix length and the rest"""
+
+    def __init__(self, file):
+        self.file = file
+        self.ids = {}
+        self.last = []
+
+    def __call__(self, path):
+        import pickle
+
+        shared = 0
+        for a, b in zip(self.last, path):
+            if a != b:
+                break
+            shared += 1
+
+        out = bytearray()
+        _put_varint(out, shared)
+        _put_varint(out, len(path) - shared)
+        for node in path[shared:]:
+            i = self.ids.get(node)
+            if i is None:
+                i = self.ids[node] = len(self.ids)
+                data = pickle.dumps(node)
+                _put_varint(out, i)
+                _put_varint(out, len(data))
+                out += data
+            else:
+                _put_varint(out, i)
+
+        self.file.write(out)
+        self.last = path
+
+
+def read_prefixed(file):
+    """the paths a PrefixWriter wrote to `file`, one list at a time"""
+    import pickle
+
+    nodes = []
+    path = []
+    while (shared := _get_varint(file)) is not None:
+        del path[shared:]
+        for _ in range(_get_varint(file)):
+            i = _get_varint(file)
+            if i == len(nodes):
+                nodes.append(pickle.loads(file.read(_get_varint(file))))
+            path.append(nodes[i])
+        yield list(path)
+
+
+def _put_varint(out, n):
+    while n >= 0x80:
+        out.append(n & 0x7f | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(file):
+    n = shift = 0
+    while byte := file.read(1):
+        n |= (byte[0] & 0x7f) << shift
+        if byte[0] < 0x80:
+            return n
+        shift += 7
+    if shift:
+        raise EOFError("path stream ends inside a number")
+    return None
+
+
+class ShortestPaths:
+    """distances and predecessors of the nodes one search settled, the rest at inf"""
+
+    def __init__(self, source, dist, prev, settled):
+        self.source = source
+        self.dist = dist
+        self.prev = prev
+        self.settled = settled
+
+    def __contains__(self, node):
+        return node in self.settled
+
+    def __len__(self):
+        return len(self.settled)
+
+    def distance(self, node):
+        return self.dist[node] if node in self else math.inf
+
+    def path(self, node):
+        """the cheapest path from source to `node`, or None"""
+        if node not in self:
+            return None
+        path = [node]
+        while node != self.source:
+            node = self.prev[node]
+            path.append(node)
+        path.reverse()
+        return path
+
+
+class PathTree:
+    """paths as a tree of shared prefixes: entry `i` is `nodes[i]` after `parents[i]`"""
+
+    def __init__(self):
+        self.nodes = []
+        self.parents = array('q')
+
+    def add(self, parent, node):
+        self.parents.append(parent)
+        self.nodes.append(node)
+        return len(self.nodes) - 1
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def path(self, i):
+        """the nodes on the path ending at entry `i`, first to last"""
         path = []
+        while i >= 0:
+            path.append(self.nodes[i])
+            i = self.parents[i]
+        path.reverse()
+        return path
+
+
+class CSRGraph(Graph):
+    """read-only Graph keeping its edges in compressed sparse rows by node id"""
+
+    def __init__(self, edges):
+        self.nodes = []
+        self.ids = {}
+
+        starts, ends, costs = array('q'), array('q'), []
+        for edge in (edges or ()):
+            starts.append(self._intern(edge.start))
+            ends.append(self._intern(edge.end))
+            costs.append(edge.cost)
+
+        latest = { (s, e): k for k, (s, e) in enumerate(zip(starts, ends)) }
+        keep = sorted(latest.values())
+
+        # counting sort on the start id, keeping input order within a row
+        n = len(self.nodes)
+        offsets = array('q', bytes(8 * (n + 1)))
+        for k in keep:
+            offsets[starts[k] + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        fill = offsets[:-1]
+        order = array('q', bytes(8 * len(keep)))
+        for k in keep:
+            s = starts[k]
+            order[fill[s]] = k
+            fill[s] += 1
+
+        self._build(offsets, [ ends[k] for k in order ], [ costs[k] for k in order ])
+
+    @classmethod
+    def from_rows(cls, nodes, offsets, targets, costs):
+        """build straight from CSR arrays, `nodes[i]` being the node with id `i`"""
+        graph = cls.__new__(cls)
+        graph.nodes = list(nodes)
+        graph.ids = { node: i for i, node in enumerate(graph.nodes) }
+        if len(graph.ids) != len(graph.nodes):
+            raise ValueError("nodes must be distinct")
+        if len(offsets) != len(graph.nodes) + 1 or offsets[-1] != len(targets):
+            raise ValueError("offsets do not match nodes and targets")
+        graph._build(array('q', offsets), targets, costs)
+        return graph
+
+    def _intern(self, node):
+        i = self.ids.get(node)
+        if i is None:
+            i = self.ids[node] = len(self.nodes)
+            self.nodes.append(node)
+        return i
+
+    def _build(self, offsets, targets, costs):
+        self.offsets = offsets
+        self.targets = array('i' if len(self.nodes) < 2 ** 31 else 'q', targets)
+        self.costs = _narrowest(costs)
+        if len(self.costs) != len(self.targets):
+            raise ValueError("every target needs a cost")
+        self.G = _CSRAdjacency(self)
+        self._reaching = {}
+        self._preds = None
 
-        return list(self.paths_between_util(start, dest, visited, path))
+    @property
+    def V(self):
+        return self.ids.keys()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def edges_from(self, i):
+        """(target id, cost) pairs for the edges leaving node id `i`"""
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return zip(self.targets[lo:hi], self.costs[lo:hi])
+
+    def neejbers(self, node):
+        i = self.ids.get(node)
+        if i is None:
+            return set()
+        nodes = self.nodes
+        return { nodes[t] for t in self.targets[self.offsets[i]:self.offsets[i + 1]] }
+
+    def shortest_paths(self, source, dest=None, h=None):
+        # the same search as Graph's, on ids and flat arrays
+        s = self.ids.get(source)
+        if s is None:
+            return super().shortest_paths(source, dest, h)
+        t = self.ids.get(dest, -1)
+
+        nodes, offsets, targets, costs = self.nodes, self.offsets, self.targets, self.costs
+        dist = [math.inf] * len(nodes)
+        prev = array('q', [-1]) * len(nodes)
+        settled = bytearray(len(nodes))
+        dist[s] = 0
+        heap = [(h(source) if h else 0, s)]
+
+        while heap:
+            _, u = heappop(heap)
+            if settled[u]:
+                continue
+            settled[u] = 1
+            if u == t:
+                break
+
+            d = dist[u]
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                alt = d + costs[k]
+                if alt < dist[v]:
+                    dist[v] = alt
+                    prev[v] = u
+                    heappush(heap, (alt + h(nodes[v]) if h else alt, v))
+
+        return _CSRShortestPaths(self, s, dist, prev, settled)
+
+    def cost(self, start, end):
+        s, e = self.ids.get(start), self.ids.get(end)
+        if s is None or e is None:
+            return math.inf
+        found = math.inf
+        for t, c in self.edges_from(s):
+            if t == e:
+                found = c
+        return found
+
+
+def _narrowest(costs):
+    # 32-bit ints, then 64-bit ints, then floats for anything else
+    if not isinstance(costs, (list, array)):
+        costs = list(costs)
+    for typecode in 'iqd':
+        try:
+            return array(typecode, costs)
+        except (OverflowError, TypeError):
+            continue
+    raise TypeError("edge costs must be numbers")
+
+
+class _CSRShortestPaths(ShortestPaths):
+    """ShortestPaths over a CSRGraph: `dist`, `prev` and `settled` are indexed by id"""
+
+    def __init__(self, graph, source, dist, prev, settled):
+        super().__init__(graph.nodes[source], dist, prev, settled)
+        self.graph = graph
+
+    def __contains__(self, node):
+        i = self.graph.ids.get(node)
+        return i is not None and self.settled[i] == 1
+
+    def __len__(self):
+        return self.settled.count(1)
+
+    def distance(self, node):
+        return self.dist[self.graph.ids[node]] if node in self else math.inf
+
+    def path(self, node):
+        if node not in self:
+            return None
+        i = self.graph.ids[node]
+        path = []
+        while i >= 0:
+            path.append(self.graph.nodes[i])
+            i = self.prev[i]
+        path.reverse()
+        return path
 
-    def paths_between_util(self, node, dest, visited, path):
-        visited[node] += 1
-        path.append(node)
+
+class _CSRAdjacency(Mapping):
+    """read-only `G` view of a CSRGraph: node -> {neejber: cost}"""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, node):
+        i = self.graph.ids.get(node)
+        if i is None:
+            return _CSREdges(self.graph, None)
+        return _CSREdges(self.graph, i)
+
+    def __contains__(self, node):
+        i = self.graph.ids.get(node)
+        return i is not None and self.graph.offsets[i] < self.graph.offsets[i + 1]
+
+    def __iter__(self):
+        graph = self.graph
+        return ( graph.nodes[i] for i in range(len(graph.nodes)) if graph.offsets[i] < graph.offsets[i + 1] )
+
+    def __len__(self):
+        return sum( 1 for _ in self )
+
+
+class _CSREdges(Mapping):
+    """read-only `G[node]` view of a CSRGraph; missing neejbers cost inf"""
+
+    def __init__(self, graph, i):
+        self.graph = graph
+        self.i = i
+
+    def _pairs(self):
+        if self.i is None:
+            return iter(())
+        graph = self.graph
+        lo, hi = graph.offsets[self.i], graph.offsets[self.i + 1]
+        return zip(map(graph.nodes.__getitem__, graph.targets[lo:hi]), graph.costs[lo:hi])
+
+    def __getitem__(self, node):
+        if self.i is None:
+            return math.inf
+        return self.graph.cost(self.graph.nodes[self.i], node)
+
+    def __contains__(self, node):
+        e = self.graph.ids.get(node)
+        return e is not None and any( t == e for t, _ in self._pairs_by_id() )
+
+    def get(self, node, default=None):
+        return self[node] if node in self else default
+
+    def _pairs_by_id(self):
+        if self.i is None:
+            return iter(())
+        return self.graph.edges_from(self.i)
+
+    def __iter__(self):
+        return ( node for node, _ in self._pairs() )
+
+    def __len__(self):
+        if self.i is None:
+            return 0
+        return self.graph.offsets[self.i + 1] - self.graph.offsets[self.i]
+
+    def items(self):
+        return self._pairs()
+
+
+class _Refuse(SimplePaths):
+    """simple paths that never enter `refused`"""
+
+    def __init__(self, refused):
+        self.refused = refused
+
+    def enter(self, state, node, bit):
+        if node == self.refused:
+            return None
+        return super().enter(state, node, bit)
+
+
+def tests(seeds = 25):
+    """check the searches against plain reference versions, return how many failed"""
+    import io
+    import random
+
+    fails = [0]
+
+    def check(expected, actual, message):
+        if expected == actual:
+            return
+        fails[0] += 1
+        print(f"{message} should return {expected}, got {actual}")
+
+    def simple_paths(graph, node, dest, seen):
         if node == dest:
-            yield list(path)
-        else:
-            for neejber in (self.neejbers(node) - set(visited.elements())):
-                yield from self.paths_between_util(neejber, dest, visited, path)
+            yield [node]
+            return
+        for neejber in graph.neejbers(node):
+            if neejber not in seen:
+                for path in simple_paths(graph, neejber, dest, seen | {neejber}):
+                    yield [node] + path
+
+    def bellman_ford(graph, source):
+        dist = {source: 0}
+        for _ in range(len(graph.V)):
+            for u in list(dist):
+                for v in graph.neejbers(u):
+                    dist[v] = min(dist.get(v, math.inf), dist[u] + graph.cost(u, v))
+        return dist
+
+    for seed in range(seeds):
+        rng = random.Random(seed)
+        nodes = list(range(10))
+        edges = [ Edge(rng.choice(nodes), rng.choice(nodes), rng.randint(1, 9)) for _ in range(25) ]
+
+        for backend in (Graph, CSRGraph):
+            graph = backend(edges)
+            name = f"{backend.__name__} seed {seed}"
+
+            expected = sorted(simple_paths(graph, 0, 9, {0}))
+            paths = graph.paths_between(0, 9)
+            check(expected, sorted(paths), f"{name}: paths_between(0, 9)")
+            check(len(expected), graph.count_paths_between(0, 9), f"{name}: count_paths_between(0, 9)")
+
+            tree = PathTree()
+            check(expected, sorted( tree.path(i) for i in graph.walk_paths(0, 9, tree=tree) ), f"{name}: walk_paths(0, 9, tree)")
+
+            stream = io.BytesIO()
+            graph.send_paths(0, 9, PrefixWriter(stream))
+            stream.seek(0)
+            check(paths, list(read_prefixed(stream)), f"{name}: read_prefixed(send_paths(0, 9))")
+
+            dist = bellman_ford(graph, 0)
+            everything = graph.shortest_paths(0)
+            for node in nodes:
+                want = dist.get(node, math.inf)
+                check(want, everything.distance(node), f"{name}: shortest_paths(0).distance({node})")
+                check(want, graph.shortest_paths(0, node).distance(node), f"{name}: shortest_paths(0, {node})")
+                path = everything.path(node)
+                check(want, graph.path_cost(path) if path else math.inf, f"{name}: path_cost(shortest_paths(0).path({node}))")
+
+    # a few in the pool, which is slow to start
+    for seed in range(3):
+        rng = random.Random(seed)
+        graph = Graph([ Edge(rng.randrange(10), rng.randrange(10)) for _ in range(30) ])
+        check(graph.paths_between(0, 9), graph.paths_between(0, 9, workers=2), f"seed {seed}: paths_between(0, 9, workers=2)")
+
+    # a policy that refuses every way out of start leaves nothing to split
+    blocked = Graph([Edge('s', 'x'), Edge('x', 'e')])
+    check([], blocked.paths_between('s', 'e', _Refuse('x'), workers=2), "paths_between('s', 'e', _Refuse('x'), workers=2)")
+    check(0, blocked.count_paths_between('s', 'e', _Refuse('x')), "count_paths_between('s', 'e', _Refuse('x'))")
+
+    # A* with the Manhattan distance on a weighted grid finds what Dijkstra does
+    rng = random.Random(0)
+    size = 12
+    edges = [
+            Edge((x, y), (x + dx, y + dy), rng.randint(1, 9))
+            for x in range(size) for y in range(size)
+            for dx, dy in ((0, -1), (-1, 0), (1, 0), (0, 1))
+            if 0 <= x + dx < size and 0 <= y + dy < size
+            ]
+    end = (size - 1, size - 1)
+    for backend in (Graph, CSRGraph):
+        graph = backend(edges)
+        found = graph.shortest_paths((0, 0), end, lambda node: abs(end[0] - node[0]) + abs(end[1] - node[1]))
+        check(graph.shortest_paths((0, 0)).distance(end), found.distance(end), f"{backend.__name__}: A* to {end}")
+
+    # far deeper than the recursion limit
+    chain = Graph([ Edge(i, i + 1) for i in range(5000) ])
+    check([list(range(5001))], chain.paths_between(0, 5000), "paths_between on a chain of 5000")
+    check(1, chain.count_paths_between(0, 5000), "count_paths_between on a chain of 5000")
+
+    return fails[0]
+
+
+if __name__ == "__main__":
+    import sys
 
-        path.pop()
-        visited[node] -= 1
+    failed = tests()
+    print(f"{failed} checks failed")
+    sys.exit(1 if failed else 0)
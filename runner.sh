@@ -2,21 +2,27 @@
 
 SCRIPTDIR="$(dirname "$(readlink -f "$0")")"
 
-YEAR=2021
-
 DAY="$(echo 0$1 | sed 's/.*\(..\)$/\1/')"
 
 INPUT="$2"
 
+# several days at once are solved in a single interpreter
+if [[ "$1" == "all" || "$1" == *[-,]* ]]; then
+    DAYS="$1"
+    [[ "$DAYS" == "all" ]] && DAYS="1-25"
+    SOURCE=example
+    [[ "$INPUT" == "input" ]] && SOURCE=input
+    exec python3 -u "$SCRIPTDIR/aoc.py" run "$DAYS" -i "$SOURCE"
+fi
+
 RUNDAY="python3 -u $DAY.py"
 
 case $INPUT in
     input)
-        TMPFILE="$(mktemp)"
-        aocd $DAY $YEAR > $TMPFILE || (rm -f $TMPFILE && exit 1)
+        # fetched once into the local store, offline from then on
+        INPUTFILE="$(python3 "$SCRIPTDIR/aoc.py" input "$DAY")" || exit 1
 
-        $RUNDAY $TMPFILE
-        rm -f $TMPFILE
+        $RUNDAY "$INPUTFILE"
         ;;
     *)
         $RUNDAY $SCRIPTDIR/$DAY-example.txt